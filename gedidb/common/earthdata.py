@@ -1,38 +1,126 @@
+import http.cookiejar
+import netrc
 import os
-import subprocess
+import requests
+import threading
+import urllib.parse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from gedidb import constants, environment
 
+EARTHDATA_HOST = "urs.earthdata.nasa.gov"
+
+# Set once this process has a valid cookie file,
+# so that repeated calls do not touch the filesystem or network.
+_AUTHENTICATED = False
+# Per-process download session, see session().
+_SESSION = None
+# Guards the lazy set-up of both of the above, since downloads call
+# session() from many threads at once. Reentrant, as session()
+# authenticates while holding it.
+_LOCK = threading.RLock()
+
 
 def authenticate():
-    if os.path.exists(environment.EARTH_DATA_COOKIE_FILE):
+    global _AUTHENTICATED
+    if _AUTHENTICATED:
         return
-    print("No authentication cookies found, fetching earthdata cookies ...")
-    netrc_file = environment.USER_PATH / ".netrc"
-    add_login = True
-    if netrc_file.exists():
-        with open(netrc_file, "r") as f:
-            if "urs.earthdata.nasa.gov" in f.read():
-                add_login = False
-
-    if add_login:
-        with open(environment.USER_PATH / ".netrc", "a+") as f:
-            f.write(
-                "\nmachine urs.earthdata.nasa.gov login {} password {}".format(
-                    environment.EARTHDATA_USER, environment.EARTHDATA_PASSWORD
+    with _LOCK:
+        if _AUTHENTICATED:
+            return
+        if os.path.exists(environment.EARTH_DATA_COOKIE_FILE):
+            _AUTHENTICATED = True
+            return
+        print("No authentication cookies found, fetching earthdata cookies ...")
+        netrc_file = environment.USER_PATH / ".netrc"
+        add_login = True
+        if netrc_file.exists():
+            with open(netrc_file, "r") as f:
+                if EARTHDATA_HOST in f.read():
+                    add_login = False
+
+        if add_login:
+            with open(environment.USER_PATH / ".netrc", "a+") as f:
+                f.write(
+                    "\nmachine {} login {} password {}".format(
+                        EARTHDATA_HOST,
+                        environment.EARTHDATA_USER,
+                        environment.EARTHDATA_PASSWORD,
+                    )
                 )
+                os.fchmod(f.fileno(), 0o600)
+
+        login, _, password = netrc.netrc(netrc_file).authenticators(
+            EARTHDATA_HOST
+        )
+        # Same (Netscape) cookie file format that wget reads when downloading.
+        jar = http.cookiejar.MozillaCookieJar(
+            environment.EARTH_DATA_COOKIE_FILE
+        )
+        with requests.Session() as session:
+            session.cookies = jar
+            response = session.get(
+                f"https://{EARTHDATA_HOST}", auth=(login, password)
+            )
+            response.raise_for_status()
+        jar.save(ignore_discard=True)
+        _AUTHENTICATED = True
+
+
+class _EarthdataSession(requests.Session):
+    """Keeps the login credentials across the Earthdata login redirects.
+
+    requests drops the Authorization header whenever a redirect changes
+    host, but data downloads redirect to the login host and back.
+    """
+
+    def rebuild_auth(self, prepared_request, response):
+        headers = prepared_request.headers
+        if "Authorization" in headers:
+            original = urllib.parse.urlparse(response.request.url).hostname
+            redirect = urllib.parse.urlparse(prepared_request.url).hostname
+            if (
+                original != redirect
+                and redirect != EARTHDATA_HOST
+                and original != EARTHDATA_HOST
+            ):
+                del headers["Authorization"]
+
+
+def session() -> requests.Session:
+    """Returns this process's pooled, authenticated download session.
+
+    Reusing one session keeps connections (and their TLS handshakes) alive
+    across downloads; transient HTTP failures are retried with backoff.
+    """
+    global _SESSION
+    with _LOCK:
+        if _SESSION is None:
+            authenticate()
+            login, _, password = netrc.netrc(
+                environment.USER_PATH / ".netrc"
+            ).authenticators(EARTHDATA_HOST)
+            download_session = _EarthdataSession()
+            download_session.auth = (login, password)
+            download_session.cookies = http.cookiejar.MozillaCookieJar(
+                environment.EARTH_DATA_COOKIE_FILE
+            )
+            try:
+                download_session.cookies.load(ignore_discard=True)
+            except OSError:
+                # e.g. a cookie file saved by wget, whose header the stdlib
+                # parser rejects; the credentials above are enough to log in.
+                pass
+            retries = Retry(
+                total=3,
+                backoff_factor=1,
+                status_forcelist=(429, 500, 502, 503, 504),
+            )
+            download_session.mount(
+                "https://",
+                HTTPAdapter(
+                    pool_connections=4, pool_maxsize=16, max_retries=retries
+                ),
             )
-            os.fchmod(f.fileno(), 0o600)
-
-    environment.EARTH_DATA_COOKIE_FILE.touch()
-    subprocess.run(
-        [
-            "wget",
-            "--load-cookies",
-            environment.EARTH_DATA_COOKIE_FILE,
-            "--save-cookies",
-            environment.EARTH_DATA_COOKIE_FILE,
-            "--keep-session-cookies",
-            "https://urs.earthdata.nasa.gov",
-        ],
-        check=True,
-    )
+            _SESSION = download_session
+    return _SESSION
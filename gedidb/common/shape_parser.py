@@ -1,5 +1,14 @@
+import hashlib
+import numpy as np
+import shapely
 from geopandas import gpd
-from shapely import geometry, orient_polygons
+from shapely import orient_polygons
+
+# Covering regions already computed, keyed by a hash of the shapes' WKB
+COVERING_CACHE_SIZE = 16
+_COVERING_REGIONS: dict[bytes, gpd.GeoSeries] = {}
+# A polygon's exterior ring has at least 3 distinct points plus the closing one
+MIN_POLYGON_COORDS = 4
 
 
 class DetailError(Exception):
@@ -9,68 +18,121 @@ class DetailError(Exception):
         self.n_coords = n_coords
 
 
+def _tiles_for_bounds(
+    minx: float, miny: float, maxx: float, maxy: float, step: int = 1
+) -> np.ndarray:
+    """Returns the step x step degree tiles of the world grid that touch
+    the given bounds, as an array of polygons.
+    """
+    # Tiles that only touch the bounds still intersect the shape,
+    # so include the neighbouring tile when a bound lies on a grid line.
+    xs = np.arange(
+        max(np.ceil(minx / step) * step - step, -180),
+        min(np.floor(maxx / step) * step + step, 180),
+        step,
+    )
+    ys = np.arange(
+        max(np.ceil(miny / step) * step - step, -90),
+        min(np.floor(maxy / step) * step + step, 90),
+        step,
+    )
+    i, j = (a.ravel() for a in np.meshgrid(xs, ys))
+    rings = np.stack(
+        [
+            np.stack([i, j], axis=-1),
+            np.stack([i + step, j], axis=-1),
+            np.stack([i + step, j + step], axis=-1),
+            np.stack([i, j + step], axis=-1),
+            np.stack([i, j], axis=-1),
+        ],
+        axis=1,
+    )
+    return shapely.polygons(rings)
+
+
 def get_covering_region_for_shape(shp: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     """The NASA CMR API can only handle shapes with less than 5000 points.
     To simplify shapes without adding lots of extra area
     (as a bounding box or convex hull would), we instead tile the region into
     covering 1x1 degree boxes, and return the union of those boxes.
+
+    Results are memoized per shape geometry, as the same shape is often
+    checked again (e.g. with a different max_coords).
     """
-    step = 1
-    # generate all the tiles in the world
-    minx = -180
-    maxx = 180
-    miny = -90
-    maxy = 90
-    tiles = []
-    for i in range(minx, maxx):
-        for j in range(maxy, miny, -step):
-            tile = geometry.box(i, j - step, i + step, j)
-            tiles.append(tile)
-    tile_df = gpd.GeoDataFrame(geometry=tiles, crs="EPSG:4326")
-
-    covering_tiles = tile_df.sjoin(shp, how="inner", predicate="intersects")
-    covering = gpd.GeoSeries(covering_tiles.union_all(), crs="EPSG:4326")
+    shapes = shp.geometry.to_numpy()
+    key = hashlib.blake2b(b"".join(shapely.to_wkb(shapes))).digest()
+    if key not in _COVERING_REGIONS:
+        if len(_COVERING_REGIONS) >= COVERING_CACHE_SIZE:
+            del _COVERING_REGIONS[next(iter(_COVERING_REGIONS))]
+        _COVERING_REGIONS[key] = _get_covering_region(shapes)
+    return _COVERING_REGIONS[key].copy()
+
+
+def _get_covering_region(shapes: np.ndarray) -> gpd.GeoSeries:
+    # only generate the tiles within the bounding box of the shape
+    tiles = _tiles_for_bounds(*shapely.total_bounds(shapes))
+
+    # The shapes are tested against many tiles, so prepare them once
+    # and let the tree only test the tiles whose boxes overlap.
+    shapely.prepare(shapes)
+    tree = shapely.STRtree(tiles)
+    _, tile_idx = tree.query(shapes, predicate="intersects")
+    covering_tiles = tiles[np.unique(tile_idx)]
+
+    # The tiles are edge-matched and never overlap, so the cheaper
+    # coverage union gives the same result as a full union. The union
+    # keeps a vertex at every tile corner along its straight edges;
+    # simplifying with zero tolerance drops exactly those.
+    covering = gpd.GeoSeries(
+        shapely.simplify(shapely.coverage_union_all(covering_tiles), 0),
+        crs="EPSG:4326",
+    )
     return covering
 
 
 def get_n_coords(shp: gpd.GeoDataFrame) -> int:
     """Returns the number of coordinates in a shape"""
-    n_coords = 0
-    for row in shp.geometry:
-        if row.geom_type.startswith("Multi"):
-            n_coords += sum([len(part.exterior.coords) for part in row.geoms])
-        else:
-            n_coords += len(row.exterior.coords)
-    return n_coords
+    # Only exteriors are counted: holes are closed before the shape is sent.
+    parts = shapely.get_parts(shp.geometry.to_numpy())
+    return int(shapely.count_coordinates(shapely.get_exterior_ring(parts)))
 
 
 def orient_shape(shp: gpd.GeoDataFrame, exterior_cw: bool) -> gpd.GeoSeries:
     """Orients the shape(s) in a GeoDataFrame to be clockwise"""
-    return shp.geometry.apply(orient_polygons, exterior_cw=exterior_cw)
+    return gpd.GeoSeries(
+        orient_polygons(shp.geometry.to_numpy(), exterior_cw=exterior_cw),
+        index=shp.index,
+        crs=shp.crs,
+        name=shp.geometry.name,
+    )
 
 
 def close_holes(shp: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     """Closes any holes in polygons in a GeoDataFrame"""
 
-    def _close_holes_in_polygon(polygon: geometry.Polygon) -> geometry.Polygon:
-        return geometry.Polygon(polygon.exterior)
-
-    def _close_holes_in_geometry(
-        geom: geometry.base.BaseGeometry,
-    ) -> geometry.base.BaseGeometry:
-        if geom.geom_type == "Polygon":
-            return _close_holes_in_polygon(geom)
-        elif geom.geom_type == "MultiPolygon":
-            closed_parts = [
-                _close_holes_in_polygon(part) for part in geom.geoms
-            ]
-            return geometry.MultiPolygon(closed_parts)
-        else:
-            return geom  # Return as is if not Polygon or MultiPolygon
-
-    closed_geometries = shp.geometry.apply(_close_holes_in_geometry)
+    def _close(polygons: np.ndarray) -> np.ndarray:
+        return shapely.polygons(shapely.get_exterior_ring(polygons))
+
+    geoms = shp.geometry.to_numpy()
+    closed_geometries = geoms.copy()  # other geometry types are kept as is
+    type_id = shapely.get_type_id(geoms)
+
+    is_polygon = type_id == shapely.GeometryType.POLYGON
+    closed_geometries[is_polygon] = _close(geoms[is_polygon])
+
+    # Close every part of every multipolygon at once, then regroup the
+    # parts by the multipolygon they came from. Empty multipolygons have
+    # no parts and are left untouched in `out`.
+    is_multi = type_id == shapely.GeometryType.MULTIPOLYGON
+    parts, part_index = shapely.get_parts(geoms[is_multi], return_index=True)
+    closed_geometries[is_multi] = shapely.multipolygons(
+        _close(parts), indices=part_index, out=geoms[is_multi].copy()
+    )
+
     return gpd.GeoDataFrame(
-        shp.drop(columns="geometry"), geometry=closed_geometries, crs=shp.crs
+        shp.drop(columns="geometry"),
+        geometry=gpd.GeoSeries(closed_geometries, index=shp.index),
+        crs=shp.crs,
     )
 
 
@@ -104,10 +166,21 @@ def check_and_format_shape(
     if max_coords > 4999:
         raise ValueError("NASA's API can only cope with less than 5000 points")
 
-    n_coords = get_n_coords(shp)
-    if n_coords > max_coords:
+    # The total coordinate count (holes included) is an upper bound on
+    # get_n_coords and needs no ring extraction, so small shapes skip it.
+    if (
+        shapely.count_coordinates(shp.geometry.to_numpy()) > max_coords
+        and (n_coords := get_n_coords(shp)) > max_coords
+    ):
         if not simplify:
             raise DetailError(n_coords)
+        # Even a single tile needs a closed ring of 4 coordinates,
+        # so do not bother computing a covering region that cannot fit.
+        if max_coords < MIN_POLYGON_COORDS:
+            raise ValueError(
+                f"A covering region has at least {MIN_POLYGON_COORDS} "
+                f"coordinates, but max_coords is {max_coords}"
+            )
         shp = get_covering_region_for_shape(shp)
         n_coords = get_n_coords(shp)
         if n_coords > max_coords:
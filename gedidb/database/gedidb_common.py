@@ -1,17 +1,56 @@
-from gedidb.database.gedidb_schema import Base
+from gedidb.database.gedidb_schema import Base, Shots
+import functools
 import sqlalchemy
 
 
 from gedidb import environment
 
+# Engines are cached per process, so every caller shares one connection
+# pool instead of opening (and handshaking) a new one per call.
+POOL_OPTIONS = dict(pool_size=8, max_overflow=16, pool_pre_ping=True)
 
+
+@functools.lru_cache(maxsize=None)
 def get_engine():
-    return sqlalchemy.create_engine(environment.DB_CONFIG, echo=False)
+    return sqlalchemy.create_engine(
+        environment.DB_CONFIG, echo=False, **POOL_OPTIONS
+    )
 
+@functools.lru_cache(maxsize=None)
 def get_test_engine():
-    return sqlalchemy.create_engine(environment.DB_TEST_CONFIG, echo=False)
+    return sqlalchemy.create_engine(
+        environment.DB_TEST_CONFIG, echo=False, **POOL_OPTIONS
+    )
 
 def maybe_create_tables():
     with get_engine().begin() as conn:
         Base.metadata.create_all(conn)
     return
+
+
+def drop_shot_indexes():
+    """Drops the secondary indexes of the shots table before a bulk load.
+
+    Maintaining them row by row dominates the load time; building them
+    once afterwards (see recreate_shot_indexes) is much cheaper.
+    The primary key is kept, so duplicate shots are still rejected.
+    """
+    with get_engine().begin() as conn:
+        # GiST geometry index of older databases, replaced by SP-GiST.
+        conn.execute(
+            sqlalchemy.text(
+                "DROP INDEX IF EXISTS idx_filtered_l2ab_l4a_shots_geometry"
+            )
+        )
+        for index in Shots.__table__.indexes:
+            index.drop(conn, checkfirst=True)
+    return
+
+
+def recreate_shot_indexes():
+    """Builds the secondary indexes of the shots table (if missing)."""
+    with get_engine().begin() as conn:
+        conn.execute(sqlalchemy.text("SET LOCAL maintenance_work_mem = '1GB'"))
+        for index in Shots.__table__.indexes:
+            index.create(conn, checkfirst=True)
+    return
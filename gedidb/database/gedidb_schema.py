@@ -7,6 +7,7 @@ from sqlalchemy import (
     Float,
     DateTime,
     ARRAY,
+    Index,
 )
 from geoalchemy2 import Geometry
 
@@ -133,7 +134,19 @@ class Shots(Base):
     agbd_t_se = mapped_column(Float, nullable=False)
 
     # Geometry data
-    geometry = mapped_column(Geometry("POINT", srid=4326), nullable=False)
+    # SP-GiST partitions space without overlapping nodes, which suits a
+    # large set of points better than GiST: a smaller index, faster scans.
+    geometry = mapped_column(
+        Geometry("POINT", srid=4326, spatial_index=False), nullable=False
+    )
+
+    __table_args__ = (
+        Index(
+            "idx_filtered_l2ab_l4a_shots_geometry_spgist",
+            "geometry",
+            postgresql_using="spgist",
+        ),
+    )
 
 
 class Granules(Base):
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import geopandas as gpd
 import h5py
 import numpy as np
@@ -13,31 +14,39 @@ from typing import Iterable, Union, List
 from gedidb.constants import WGS84
 from gedidb.granule import granule_name
 
-QDEGRADE = [0, 3, 8, 10, 13, 18, 20, 23, 28, 30, 33, 38, 40, 43, 48, 60, 63, 68]
+# Immutable, so that QDEGRADE_LUT cannot drift out of sync with it.
+QDEGRADE = (0, 3, 8, 10, 13, 18, 20, 23, 28, 30, 33, 38, 40, 43, 48, 60, 63, 68)
+# Membership table for QDEGRADE, indexed by the uint8 degrade_flag.
+QDEGRADE_LUT = np.zeros(256, dtype=bool)
+QDEGRADE_LUT[list(QDEGRADE)] = True
+QDEGRADE_LUT.flags.writeable = False
+# Per-dataset HDF5 chunk cache. The h5py default (1MB) is smaller than
+# a single chunk of the large 2D datasets (rh, waveforms), which would
+# otherwise be decompressed again for every read that touches them.
+CHUNK_CACHE_BYTES = 64 * 1024 * 1024
+# Reference epoch of the GEDI delta_time datasets.
+GEDI_EPOCH = np.datetime64("2018-01-01T00:00:00", "ns")
 
 
 class GediGranule(h5py.File):  # TODO  pylint: disable=missing-class-docstring
     def __init__(self, file_path: pathlib.Path):
-        super().__init__(file_path, "r")
+        super().__init__(file_path, "r", rdcc_nbytes=CHUNK_CACHE_BYTES)
         self.file_path = file_path
         self.beam_names = [
             name for name in self.keys() if name.startswith("BEAM")
         ]
-        self._parsed_filename_metadata = None
 
-    @property
+    # Granule-level metadata is read from the file (and parsed) once, then
+    # shared by every beam instead of hitting the HDF5 attributes again.
+    @functools.cached_property
     def filename_metadata(self) -> granule_name.GediNameMetadata:
-        if self._parsed_filename_metadata is None:
-            self._parsed_filename_metadata = (
-                granule_name.parse_granule_filename(self.filename)
-            )
-        return self._parsed_filename_metadata
+        return granule_name.parse_granule_filename(self.filename)
 
-    @property
+    @functools.cached_property
     def version(self) -> str:
         return self["METADATA"]["DatasetIdentification"].attrs["VersionID"]
 
-    @property
+    @functools.cached_property
     def start_datetime(self) -> pd.Timestamp:
         return pd.to_datetime(
             (
@@ -50,19 +59,19 @@ class GediGranule(h5py.File):  # TODO  pylint: disable=missing-class-docstring
             format="%Y.%j.%H:%M:%S",
         )
 
-    @property
+    @functools.cached_property
     def product(self) -> str:
         return self["METADATA"]["DatasetIdentification"].attrs["shortName"]
 
-    @property
+    @functools.cached_property
     def uuid(self) -> str:
         return self["METADATA"]["DatasetIdentification"].attrs["uuid"]
 
-    @property
+    @functools.cached_property
     def filename(self) -> str:
         return self["METADATA"]["DatasetIdentification"].attrs["fileName"]
 
-    @property
+    @functools.cached_property
     def abstract(self) -> str:
         return self["METADATA"]["DatasetIdentification"].attrs["abstract"]
 
@@ -143,6 +152,7 @@ class GediBeam(h5py.Group):
         self.parent_granule = granule  # Reference to parent granule
         self._cached_data = None
         self._shot_geolocations = None
+        self._arrays: dict[str, np.ndarray] = {}  # raw datasets, see _read
 
     def list_datasets(self, top_level_only: bool = True) -> list[str]:
         if top_level_only:
@@ -184,10 +194,18 @@ class GediBeam(h5py.Group):
             gpd.GeoDataFrame: A geopandas DataFrame containing the main data for the given beam object.
         """
         if self._cached_data is None:
-            data = self._get_main_data_dict()
-            geometry = self.shot_geolocations
+            data = {
+                # Per-beam identifiers, shared by every product
+                "granule_name": self._broadcast(self.parent_granule.filename),
+                "beam_type": self._broadcast(self.beam_type),
+                "beam_name": self._broadcast(self.name),
+                **self._get_main_data_dict(),
+                "geometry": self.shot_geolocations,
+            }
+            # The columns are freshly read arrays, so wrap them as-is
+            # instead of copying each into consolidated blocks.
             self._cached_data = gpd.GeoDataFrame(
-                data, geometry=geometry, crs=WGS84
+                data, geometry="geometry", crs=WGS84, copy=False
             )
 
         return self._cached_data
@@ -199,27 +217,102 @@ class GediBeam(h5py.Group):
         """
         array_cols = [c for c in self.main_data.columns if c.endswith("_z")]
         for c in array_cols:
-            self._cached_data[c] = self.main_data[c].map(self._arr_to_str)
+            self._cached_data[c] = self._arrs_to_str(self.main_data[c])
+
+    def select_columns(self, columns: Iterable[str]) -> None:
+        """Drops all main data columns except the given ones (and geometry).
+
+        Until this function is called, main_data holds every column. This
+        selection can be undone by resetting the cache.
+        """
+        keep = set(columns) | {"geometry"}
+        self._cached_data = self.main_data[
+            [c for c in self.main_data.columns if c in keep]
+        ]
 
     def reset_cache(self):
         self._cached_data = None
 
+    def _read(self, path: str) -> np.ndarray:
+        """Reads a whole dataset of this beam, at most once per beam."""
+        if path not in self._arrays:
+            self._arrays[path] = self[path][:]
+        return self._arrays[path]
+
+    def _bulk_read(self, paths: Iterable[str]) -> dict[str, np.ndarray]:
+        """Reads whole datasets of this beam, keyed by their relative path.
+
+        Datasets are read group by group, so each group is resolved once
+        and neighbouring datasets are read back to back. Like _read, each
+        dataset is only read once per beam.
+
+        The reads are sequential rather than issued from a thread pool:
+        h5py serializes every HDF5 call (decompression included) behind
+        one global lock, so concurrent reads would not overlap.
+        """
+        paths = list(dict.fromkeys(paths))
+        by_group = {}
+        for path in paths:
+            if path not in self._arrays:
+                group, _, name = path.rpartition("/")
+                by_group.setdefault(group, []).append((path, name))
+        for group, datasets in by_group.items():
+            hdf_group = self[group] if group else self
+            for path, name in datasets:
+                self._arrays[path] = hdf_group[name][:]
+        return {path: self._arrays[path] for path in paths}
+
+    @staticmethod
+    def _absolute_time(delta_time: np.ndarray) -> pd.DatetimeIndex:
+        """Converts delta_time (seconds since the GEDI epoch) to UTC times.
+
+        Same integer arithmetic as pd.to_timedelta(unit="seconds"), without
+        the intermediate TimedeltaIndex and tz-aware addition.
+        """
+        nan = np.isnan(delta_time)
+        with np.errstate(invalid="ignore"):
+            seconds = delta_time.astype(np.int64)
+            frac = np.round(delta_time - seconds, 9)
+            ns = seconds * 10**9 + (frac * 1e9).astype(np.int64)
+        absolute_time = GEDI_EPOCH + ns.view("timedelta64[ns]")
+        absolute_time[nan] = np.datetime64("NaT")
+        return pd.DatetimeIndex(absolute_time).tz_localize("UTC")
+
+    def _broadcast(self, value: Union[str, float]) -> pd.Categorical:
+        """Repeats a per-beam value for every shot as a one-category column."""
+        return pd.Categorical.from_codes(
+            np.zeros(self.n_shots, dtype=np.int8), categories=[value]
+        )
+
     def _accumulate_waveform_data(
-        self, name: str, start: int, end: int
-    ) -> np.array:
-        waveform_data_all = np.array(self[name][:])
-        data = []
-        for i in range(len(start)):
-            dz = waveform_data_all[
-                start[i] : end[i]
-            ]  # this is a view, not a copy
-            data.append(dz)
-        return data
+        self, name: str, start: np.ndarray, end: np.ndarray
+    ) -> List[np.ndarray]:
+        # Read the dataset once; each shot's waveform is a view into it.
+        waveform_data_all = self[name][:]
+        return [waveform_data_all[s:e] for s, e in zip(start, end)]
 
     def _arr_to_str(self, arr: Union[List[float], np.array]) -> str:
         """Converts array type data to SQL-friendly string."""
         return "{" + ", ".join(map(str, arr)) + "}"
 
+    def _arrs_to_str(self, col: pd.Series) -> pd.Series:
+        """Converts a column of equal-length arrays to SQL-friendly strings.
+
+        Formats every element in one numpy call instead of per element;
+        the output matches _arr_to_str applied row by row.
+        """
+        if col.empty:
+            return col
+        try:
+            values = np.stack(col.to_numpy())
+        except ValueError:  # ragged arrays
+            return col.map(self._arr_to_str)
+        return pd.Series(
+            ["{" + ", ".join(row) + "}" for row in values.astype(str)],
+            index=col.index,
+            name=col.name,
+        )
+
     def __repr__(self) -> str:
         description = (
             "GEDI Beam object:\n"
@@ -2,10 +2,12 @@ import datetime
 import geopandas as gpd
 import pandas as pd
 import pathlib
+import shapely
 import xarray
 
 from gedidb.granule.gedi_granule import GediGranule, GediBeam
 from gedidb.granule import granule_name
+from gedidb.constants import WGS84
 
 
 class L1BBeam(GediBeam):
@@ -14,12 +16,12 @@ class L1BBeam(GediBeam):
 
     @property
     def shot_geolocations(self) -> gpd.array.GeometryArray:
-        if self._shot_geolocations == None:
-            self._shot_geolocations = gpd.points_from_xy(
-                x=self["geolocation/longitude_lastbin"],
-                y=self["geolocation/latitude_lastbin"],
-                crs="EPSG:4326",
+        if self._shot_geolocations is None:
+            points = shapely.points(
+                self._read("geolocation/longitude_lastbin"),
+                self._read("geolocation/latitude_lastbin"),
             )
+            self._shot_geolocations = gpd.array.from_shapely(points, crs=WGS84)
         return self._shot_geolocations
 
     def _get_main_data_dict(self) -> dict:
@@ -30,43 +32,39 @@ class L1BBeam(GediBeam):
             dict: A dictionary containing the main data for all shots in the given
                 beam of the granule.
         """
+        geolocation = self["geolocation"]
         data = {
             # General identifiable data
-            "granule_name": [self.parent_granule.filename] * self.n_shots,
             "shot_number": self["shot_number"][:],
-            "beam_type": [self.beam_type] * self.n_shots,
-            "beam_name": [self.name] * self.n_shots,
             # Temporal data
             "delta_time": self["delta_time"][:],
             # Quality data
-            "degrade": self["geolocation/degrade"][:],
+            "degrade": geolocation["degrade"][:],
             "stale_return_flag": self["stale_return_flag"][:],
-            "solar_elevation": self["geolocation/solar_elevation"][:],
-            "solar_azimuth": self["geolocation/solar_elevation"][:],
+            "solar_elevation": geolocation["solar_elevation"][:],
+            "solar_azimuth": geolocation["solar_azimuth"][:],
             "rx_energy": self["rx_energy"][:],
             # DEM
-            "dem_tandemx": self["geolocation/digital_elevation_model"][:],
-            "dem_srtm": self["geolocation/digital_elevation_model_srtm"][:],
+            "dem_tandemx": geolocation["digital_elevation_model"][:],
+            "dem_srtm": geolocation["digital_elevation_model_srtm"][:],
             # geolocation bin0
-            "latitude_bin0": self["geolocation/latitude_bin0"][:],
-            "latitude_bin0_error": self["geolocation/latitude_bin0_error"][:],
-            "longitude_bin0": self["geolocation/longitude_bin0"][:],
-            "longitude_bin0_error": self["geolocation/longitude_bin0_error"][:],
-            "elevation_bin0": self["geolocation/elevation_bin0"][:],
-            "elevation_bin0_error": self["geolocation/elevation_bin0_error"][:],
+            "latitude_bin0": geolocation["latitude_bin0"][:],
+            "latitude_bin0_error": geolocation["latitude_bin0_error"][:],
+            "longitude_bin0": geolocation["longitude_bin0"][:],
+            "longitude_bin0_error": geolocation["longitude_bin0_error"][:],
+            "elevation_bin0": geolocation["elevation_bin0"][:],
+            "elevation_bin0_error": geolocation["elevation_bin0_error"][:],
             # geolocation lastbin
-            "latitude_lastbin": self["geolocation/latitude_lastbin"][:],
-            "latitude_lastbin_error": self[
-                "geolocation/latitude_lastbin_error"
-            ][:],
-            "longitude_lastbin": self["geolocation/longitude_lastbin"][:],
-            "longitude_lastbin_error": self[
-                "geolocation/longitude_lastbin_error"
-            ][:],
-            "elevation_lastbin": self["geolocation/elevation_lastbin"][:],
-            "elevation_lastbin_error": self[
-                "geolocation/elevation_lastbin_error"
-            ][:],
+            "latitude_lastbin": self._read("geolocation/latitude_lastbin"),
+            "latitude_lastbin_error": geolocation["latitude_lastbin_error"][:],
+            "longitude_lastbin": self._read("geolocation/longitude_lastbin"),
+            "longitude_lastbin_error": geolocation["longitude_lastbin_error"][
+                :
+            ],
+            "elevation_lastbin": geolocation["elevation_lastbin"][:],
+            "elevation_lastbin_error": geolocation["elevation_lastbin_error"][
+                :
+            ],
             # relative waveform position info in beam and ssub-granule
             "waveform_start": self["rx_sample_start_index"][:] - 1,
             "waveform_count": self["rx_sample_count"][:],
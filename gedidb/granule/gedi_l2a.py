@@ -1,9 +1,11 @@
 import geopandas as gpd
-import pandas as pd
+import numpy as np
 import pathlib
+import shapely
 
 from gedidb.granule import gedi_granule
 from gedidb.granule import granule_name
+from gedidb.constants import WGS84
 
 
 class L2ABeam(gedi_granule.GediBeam):
@@ -12,12 +14,11 @@ class L2ABeam(gedi_granule.GediBeam):
 
     @property
     def shot_geolocations(self) -> gpd.array.GeometryArray:
-        if self._shot_geolocations == None:
-            self._shot_geolocations = gpd.points_from_xy(
-                x=self["lon_lowestmode"],
-                y=self["lat_lowestmode"],
-                crs="EPSG:4326",
+        if self._shot_geolocations is None:
+            points = shapely.points(
+                self._read("lon_lowestmode"), self._read("lat_lowestmode")
             )
+            self._shot_geolocations = gpd.array.from_shapely(points, crs=WGS84)
         return self._shot_geolocations
 
     def _get_main_data_dict(self) -> dict:
@@ -28,31 +29,28 @@ class L2ABeam(gedi_granule.GediBeam):
             dict: A dictionary containing the main data for all shots in the given
                 beam of the granule.
         """
-        gedi_l2a_count_start = pd.to_datetime("2018-01-01T00:00:00Z")
+        delta_time = self["delta_time"][:]
+        geolocation = self["geolocation"]
+        # Read the 2D rh dataset once and slice it in memory.
+        rh = self["rh"][:]
         data = {
             # General identifiable data
-            "granule_name": [self.parent_granule.filename] * self.n_shots,
             "shot_number": self["shot_number"][:],
-            "beam_type": [self.beam_type] * self.n_shots,
-            "beam_name": [self.name] * self.n_shots,
             # Temporal data
-            "delta_time": self["delta_time"][:],
-            "absolute_time": (
-                gedi_l2a_count_start
-                + pd.to_timedelta(self["delta_time"], unit="seconds")
-            ),
+            "delta_time": delta_time,
+            "absolute_time": self._absolute_time(delta_time),
             # Quality data
             "sensitivity_a0": self["sensitivity"][:],
-            "sensitivity_a1": self["geolocation/sensitivity_a1"][:],
-            "sensitivity_a2": self["geolocation/sensitivity_a2"][:],
-            "sensitivity_a3": self["geolocation/sensitivity_a3"][:],
-            "sensitivity_a4": self["geolocation/sensitivity_a4"][:],
-            "sensitivity_a5": self["geolocation/sensitivity_a5"][:],
-            "sensitivity_a6": self["geolocation/sensitivity_a6"][:],
+            "sensitivity_a1": geolocation["sensitivity_a1"][:],
+            "sensitivity_a2": geolocation["sensitivity_a2"][:],
+            "sensitivity_a3": geolocation["sensitivity_a3"][:],
+            "sensitivity_a4": geolocation["sensitivity_a4"][:],
+            "sensitivity_a5": geolocation["sensitivity_a5"][:],
+            "sensitivity_a6": geolocation["sensitivity_a6"][:],
             "quality_flag": self["quality_flag"][:],
             "degrade_flag": self["degrade_flag"][:],
             "solar_elevation": self["solar_elevation"][:],
-            "solar_azimuth": self["solar_elevation"][:],
+            "solar_azimuth": self["solar_azimuth"][:],
             "energy_total": self["energy_total"][:],
             "surface_flag": self["surface_flag"][:],
             # DEM
@@ -64,16 +62,16 @@ class L2ABeam(gedi_granule.GediBeam):
             "selected_algorithm": self["selected_algorithm"][:],
             "selected_mode": self["selected_mode"][:],
             # Geolocation data
-            "lon_lowestmode": self["lon_lowestmode"][:],
+            "lon_lowestmode": self._read("lon_lowestmode"),
             "longitude_bin0_error": self["longitude_bin0_error"][:],
-            "lat_lowestmode": self["lat_lowestmode"][:],
+            "lat_lowestmode": self._read("lat_lowestmode"),
             "latitude_bin0_error": self["latitude_bin0_error"][:],
             "elev_lowestmode": self["elev_lowestmode"][:],
             "elevation_bin0_error": self["elevation_bin0_error"][:],
             "lon_highestreturn": self["lon_highestreturn"][:],
             "lat_highestreturn": self["lat_highestreturn"][:],
             "elev_highestreturn": self["elev_highestreturn"][:],
-        } | {f"rh_{i}": self["rh"][:, i] for i in range(101)}
+        } | {f"rh_{i}": rh[:, i] for i in range(101)}
         return data
 
     def quality_filter(self):
@@ -86,19 +84,24 @@ class L2ABeam(gedi_granule.GediBeam):
         filtered["elevation_difference_tdx"] = (
             filtered["elev_lowestmode"] - filtered["digital_elevation_model"]
         )
-        filtered = filtered[
-            (filtered["quality_flag"] == 1)
-            & (filtered["sensitivity_a0"] >= 0.9)
-            & (filtered["sensitivity_a0"] <= 1.0)
-            & (filtered["sensitivity_a2"] > 0.95)
-            & (filtered["sensitivity_a2"] <= 1.0)
-            & (filtered["degrade_flag"].isin(gedi_granule.QDEGRADE))
-            & (filtered["rh_100"] >= 0)
-            & (filtered["rh_100"] < 120)
-            & (filtered["surface_flag"] == 1)
-            & (filtered["elevation_difference_tdx"] > -150)
-            & (filtered["elevation_difference_tdx"] < 150)
-        ]
+        # Combine the conditions in place on the raw arrays, rather than
+        # allocating a new boolean Series for every comparison and `&`.
+        sensitivity_a0 = filtered["sensitivity_a0"].to_numpy()
+        sensitivity_a2 = filtered["sensitivity_a2"].to_numpy()
+        rh_100 = filtered["rh_100"].to_numpy()
+        elevation_difference = filtered["elevation_difference_tdx"].to_numpy()
+        mask = filtered["quality_flag"].to_numpy() == 1
+        mask &= sensitivity_a0 >= 0.9
+        mask &= sensitivity_a0 <= 1.0
+        mask &= sensitivity_a2 > 0.95
+        mask &= sensitivity_a2 <= 1.0
+        mask &= gedi_granule.QDEGRADE_LUT[filtered["degrade_flag"].to_numpy()]
+        mask &= rh_100 >= 0
+        mask &= rh_100 < 120
+        mask &= filtered["surface_flag"].to_numpy() == 1
+        mask &= elevation_difference > -150
+        mask &= elevation_difference < 150
+        filtered = filtered.iloc[np.flatnonzero(mask)]
         filtered = filtered.drop(["quality_flag", "surface_flag"], axis=1)
         self._cached_data = filtered
 
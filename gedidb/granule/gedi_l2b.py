@@ -1,24 +1,96 @@
 import geopandas as gpd
 import numpy as np
-import pandas as pd
 import pathlib
+import shapely
 
 from gedidb.granule import gedi_granule
 from gedidb.granule import granule_name
+from gedidb.constants import WGS84
 
 
 class L2BBeam(gedi_granule.GediBeam):
+    # (column, dataset) pairs making up the main data, in column order.
+    _COLUMNS = (
+        # General identifiable data
+        ("shot_number", "shot_number"),
+        # Temporal data
+        ("delta_time", "geolocation/delta_time"),
+        ("absolute_time", "delta_time"),  # derived below
+        # Quality data
+        ("algorithmrun_flag", "algorithmrun_flag"),
+        ("l2a_quality_flag", "l2a_quality_flag"),
+        ("l2b_quality_flag", "l2b_quality_flag"),
+        ("sensitivity", "sensitivity"),
+        ("degrade_flag", "geolocation/degrade_flag"),
+        ("stale_return_flag", "stale_return_flag"),
+        ("surface_flag", "surface_flag"),
+        ("solar_elevation", "geolocation/solar_elevation"),
+        ("solar_azimuth", "geolocation/solar_azimuth"),
+        # Scientific data
+        ("cover", "cover"),
+        ("cover_z", "cover_z"),  # derived below
+        ("fhd_normal", "fhd_normal"),
+        ("num_detectedmodes", "num_detectedmodes"),
+        ("omega", "omega"),
+        ("pai", "pai"),
+        ("pai_z", "pai_z"),  # derived below
+        ("pavd_z", "pavd_z"),  # derived below
+        ("pgap_theta", "pgap_theta"),
+        ("pgap_theta_error", "pgap_theta_error"),
+        ("rg", "rg"),
+        ("rh100", "rh100"),
+        ("rhog", "rhog"),
+        ("rhog_error", "rhog_error"),
+        ("rhov", "rhov"),
+        ("rhov_error", "rhov_error"),
+        ("rossg", "rossg"),
+        ("rv", "rv"),
+        ("rx_range_highestreturn", "rx_range_highestreturn"),
+        # DEM
+        ("digital_elevation_model", "geolocation/digital_elevation_model"),
+        # Land cover data: NOTE this is gridded and/or derived data
+        ("leaf_off_flag", "land_cover_data/leaf_off_flag"),
+        ("leaf_on_doy", "land_cover_data/leaf_on_doy"),
+        ("leaf_on_cycle", "land_cover_data/leaf_on_cycle"),
+        ("water_persistence", "land_cover_data/landsat_water_persistence"),
+        ("urban_proportion", "land_cover_data/urban_proportion"),
+        ("modis_nonvegetated", "land_cover_data/modis_nonvegetated"),
+        ("modis_treecover", "land_cover_data/modis_treecover"),
+        ("pft_class", "land_cover_data/pft_class"),
+        ("region_class", "land_cover_data/region_class"),
+        # Processing data
+        ("selected_l2a_algorithm", "selected_l2a_algorithm"),
+        ("selected_rg_algorithm", "selected_rg_algorithm"),
+        ("dz", "ancillary/dz"),  # derived below
+        # Geolocation data
+        ("lon_highestreturn", "geolocation/lon_highestreturn"),
+        ("lon_lowestmode", "geolocation/lon_lowestmode"),
+        ("longitude_bin0", "geolocation/longitude_bin0"),
+        ("longitude_bin0_error", "geolocation/longitude_bin0_error"),
+        ("lat_highestreturn", "geolocation/lat_highestreturn"),
+        ("lat_lowestmode", "geolocation/lat_lowestmode"),
+        ("latitude_bin0", "geolocation/latitude_bin0"),
+        ("latitude_bin0_error", "geolocation/latitude_bin0_error"),
+        ("elev_highestreturn", "geolocation/elev_highestreturn"),
+        ("elev_lowestmode", "geolocation/elev_lowestmode"),
+        ("elevation_bin0", "geolocation/elevation_bin0"),
+        ("elevation_bin0_error", "geolocation/elevation_bin0_error"),
+        # waveform data
+        ("waveform_count", "rx_sample_count"),
+        ("waveform_start", "rx_sample_start_index"),  # derived below
+    )
+
     def __init__(self, granule: gedi_granule.GediGranule, beam_name: str):
         super().__init__(granule=granule, beam_name=beam_name)
 
     @property
     def shot_geolocations(self) -> gpd.array.GeometryArray:
-        if self._shot_geolocations == None:
-            self._shot_geolocations = gpd.points_from_xy(
-                x=self["geolocation/lon_lowestmode"],
-                y=self["geolocation/lat_lowestmode"],
-                crs="EPSG:4326",
+        if self._shot_geolocations is None:
+            points = shapely.points(
+                self._read("geolocation/lon_lowestmode"),
+                self._read("geolocation/lat_lowestmode"),
             )
+            self._shot_geolocations = gpd.array.from_shapely(points, crs=WGS84)
         return self._shot_geolocations
 
     def _get_main_data_dict(self) -> dict:
@@ -29,86 +101,17 @@ class L2BBeam(gedi_granule.GediBeam):
             dict: A dictionary containing the main data for all shots in the given
                 beam of the granule.
         """
-        gedi_l2b_count_start = pd.to_datetime("2018-01-01T00:00:00Z")
-        data = {
-            # General identifiable data
-            "granule_name": [self.parent_granule.filename] * self.n_shots,
-            "shot_number": self["shot_number"][:],
-            "beam_type": [self.beam_type] * self.n_shots,
-            "beam_name": [self.name] * self.n_shots,
-            # Temporal data
-            "delta_time": self["geolocation/delta_time"][:],
-            "absolute_time": (
-                gedi_l2b_count_start
-                + pd.to_timedelta(self["delta_time"], unit="seconds")
-            ),
-            # Quality data
-            "algorithmrun_flag": self["algorithmrun_flag"][:],
-            "l2a_quality_flag": self["l2a_quality_flag"][:],
-            "l2b_quality_flag": self["l2b_quality_flag"][:],
-            "sensitivity": self["sensitivity"][:],
-            "degrade_flag": self["geolocation/degrade_flag"][:],
-            "stale_return_flag": self["stale_return_flag"][:],
-            "surface_flag": self["surface_flag"][:],
-            "solar_elevation": self["geolocation/solar_elevation"][:],
-            "solar_azimuth": self["geolocation/solar_azimuth"][:],
-            # Scientific data
-            "cover": self["cover"][:],
-            "cover_z": list(self["cover_z"][:]),
-            "fhd_normal": self["fhd_normal"][:],
-            "num_detectedmodes": self["num_detectedmodes"][:],
-            "omega": self["omega"][:],
-            "pai": self["pai"][:],
-            "pai_z": list(self["pai_z"][:]),
-            "pavd_z": list(self["pavd_z"][:].tolist()),
-            "pgap_theta": self["pgap_theta"][:],
-            "pgap_theta_error": self["pgap_theta_error"][:],
-            "rg": self["rg"][:],
-            "rh100": self["rh100"][:],
-            "rhog": self["rhog"][:],
-            "rhog_error": self["rhog_error"][:],
-            "rhov": self["rhov"][:],
-            "rhov_error": self["rhov_error"][:],
-            "rossg": self["rossg"][:],
-            "rv": self["rv"][:],
-            "rx_range_highestreturn": self["rx_range_highestreturn"][:],
-            # DEM
-            "digital_elevation_model": self[
-                "geolocation/digital_elevation_model"
-            ][:],
-            # Land cover data: NOTE this is gridded and/or derived data
-            "leaf_off_flag": self["land_cover_data/leaf_off_flag"][:],
-            "leaf_on_doy": self["land_cover_data/leaf_on_doy"][:],
-            "leaf_on_cycle": self["land_cover_data/leaf_on_cycle"][:],
-            "water_persistence": self[
-                "land_cover_data/landsat_water_persistence"
-            ][:],
-            "urban_proportion": self["land_cover_data/urban_proportion"][:],
-            "modis_nonvegetated": self["land_cover_data/modis_nonvegetated"][:],
-            "modis_treecover": self["land_cover_data/modis_treecover"][:],
-            "pft_class": self["land_cover_data/pft_class"][:],
-            "region_class": self["land_cover_data/region_class"][:],
-            # Processing data
-            "selected_l2a_algorithm": self["selected_l2a_algorithm"][:],
-            "selected_rg_algorithm": self["selected_rg_algorithm"][:],
-            "dz": np.repeat(self["ancillary/dz"][:], self.n_shots),
-            # Geolocation data
-            "lon_highestreturn": self["geolocation/lon_highestreturn"][:],
-            "lon_lowestmode": self["geolocation/lon_lowestmode"][:],
-            "longitude_bin0": self["geolocation/longitude_bin0"][:],
-            "longitude_bin0_error": self["geolocation/longitude_bin0_error"][:],
-            "lat_highestreturn": self["geolocation/lat_highestreturn"][:],
-            "lat_lowestmode": self["geolocation/lat_lowestmode"][:],
-            "latitude_bin0": self["geolocation/latitude_bin0"][:],
-            "latitude_bin0_error": self["geolocation/latitude_bin0_error"][:],
-            "elev_highestreturn": self["geolocation/elev_highestreturn"][:],
-            "elev_lowestmode": self["geolocation/elev_lowestmode"][:],
-            "elevation_bin0": self["geolocation/elevation_bin0"][:],
-            "elevation_bin0_error": self["geolocation/elevation_bin0_error"][:],
-            # waveform data
-            "waveform_count": self["rx_sample_count"][:],
-            "waveform_start": self["rx_sample_start_index"][:] - 1,
-        }
+        arrays = self._bulk_read(path for _, path in self._COLUMNS)
+        data = {name: arrays[path] for name, path in self._COLUMNS}
+        data["absolute_time"] = self._absolute_time(data["absolute_time"])
+        data["cover_z"] = list(data["cover_z"])
+        data["pai_z"] = list(data["pai_z"])
+        # Widened to float64 (as tolist() did) so the SQL text keeps
+        # the exact float64 value, but still stored as row views.
+        data["pavd_z"] = list(data["pavd_z"].astype(np.float64))
+        # dz is a single ancillary value for the whole beam
+        data["dz"] = self._broadcast(data["dz"].item())
+        data["waveform_start"] = data["waveform_start"] - 1
 
         # For now, we're not using pgap_theta_z
         # but leaving this code here in case someone finds it useful
@@ -130,25 +133,29 @@ class L2BBeam(gedi_granule.GediBeam):
         filtered["elevation_difference_tdx"] = (
             filtered["elev_lowestmode"] - filtered["digital_elevation_model"]
         )
-        filtered = filtered[
-            (filtered["l2a_quality_flag"] == 1)
-            & (filtered["l2b_quality_flag"] == 1)
-            & (filtered["algorithmrun_flag"] == 1)
-            & (filtered["sensitivity"] >= 0.9)
-            & (filtered["sensitivity"] <= 1.0)
-            & (filtered["degrade_flag"].isin(gedi_granule.QDEGRADE))
-            & (filtered["rh100"] >= 0)
-            # L2B RH_100 is in cm, not m like L2A
-            & (filtered["rh100"] < 12000)
-            & (filtered["surface_flag"] == 1)
-            & (filtered["elevation_difference_tdx"] > -150)
-            & (filtered["elevation_difference_tdx"] < 150)
-            & (filtered["water_persistence"] < 10)
-            & (filtered["urban_proportion"] < 50)
-            # Additional (Amelia) filters:
-            & (~np.isnan(filtered["cover"]))
-            & (filtered["pai"] != -9999.0)
-        ]
+        # Combine the conditions in place on the raw arrays, rather than
+        # allocating a new boolean Series for every comparison and `&`.
+        sensitivity = filtered["sensitivity"].to_numpy()
+        rh100 = filtered["rh100"].to_numpy()
+        elevation_difference = filtered["elevation_difference_tdx"].to_numpy()
+        mask = filtered["l2a_quality_flag"].to_numpy() == 1
+        mask &= filtered["l2b_quality_flag"].to_numpy() == 1
+        mask &= filtered["algorithmrun_flag"].to_numpy() == 1
+        mask &= sensitivity >= 0.9
+        mask &= sensitivity <= 1.0
+        mask &= gedi_granule.QDEGRADE_LUT[filtered["degrade_flag"].to_numpy()]
+        mask &= rh100 >= 0
+        # L2B RH_100 is in cm, not m like L2A
+        mask &= rh100 < 12000
+        mask &= filtered["surface_flag"].to_numpy() == 1
+        mask &= elevation_difference > -150
+        mask &= elevation_difference < 150
+        mask &= filtered["water_persistence"].to_numpy() < 10
+        mask &= filtered["urban_proportion"].to_numpy() < 50
+        # Additional (Amelia) filters:
+        mask &= ~np.isnan(filtered["cover"].to_numpy())
+        mask &= filtered["pai"].to_numpy() != -9999.0
+        filtered = filtered.iloc[np.flatnonzero(mask)]
         filtered = filtered.drop(
             [
                 "l2a_quality_flag",
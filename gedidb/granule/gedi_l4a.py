@@ -1,6 +1,7 @@
 import geopandas as gpd
-import pandas as pd
+import numpy as np
 import pathlib
+import shapely
 
 from gedidb.granule import gedi_granule
 from gedidb.granule import granule_name
@@ -8,17 +9,60 @@ from gedidb.constants import WGS84
 
 
 class L4ABeam(gedi_granule.GediBeam):
+    # (column, dataset) pairs making up the main data, in column order.
+    _COLUMNS = (
+        # General identifiable data
+        ("shot_number", "shot_number"),
+        # Temporal data
+        ("delta_time", "delta_time"),
+        ("absolute_time", "delta_time"),  # derived below
+        # Quality data
+        ("sensitivity_a0", "sensitivity"),
+        ("sensitivity_a2", "geolocation/sensitivity_a2"),
+        ("sensitivity_a10", "geolocation/sensitivity_a10"),
+        ("algorithm_run_flag", "algorithm_run_flag"),
+        ("degrade_flag", "degrade_flag"),
+        ("l2_quality_flag", "l2_quality_flag"),
+        ("l4_quality_flag", "l4_quality_flag"),
+        ("predictor_limit_flag", "predictor_limit_flag"),
+        ("response_limit_flag", "response_limit_flag"),
+        ("surface_flag", "surface_flag"),
+        # Processing data
+        ("selected_algorithm", "selected_algorithm"),
+        ("selected_mode", "selected_mode"),
+        # Geolocation data
+        ("elev_lowestmode", "elev_lowestmode"),
+        ("lat_lowestmode", "lat_lowestmode"),
+        ("lon_lowestmode", "lon_lowestmode"),
+        # ABGD data
+        ("agbd", "agbd"),
+        ("agbd_pi_lower", "agbd_pi_lower"),
+        ("agbd_pi_upper", "agbd_pi_upper"),
+        ("agbd_se", "agbd_se"),
+        ("agbd_t", "agbd_t"),
+        ("agbd_t_se", "agbd_t_se"),
+        # Land cover data: NOTE this is gridded and/or derived data
+        ("pft_class", "land_cover_data/pft_class"),
+        ("region_class", "land_cover_data/region_class"),
+        ("urban_proportion", "land_cover_data/urban_proportion"),
+        (
+            "landsat_water_persistence",
+            "land_cover_data/landsat_water_persistence",
+        ),
+        ("leaf_on_doy", "land_cover_data/leaf_on_doy"),
+        ("leaf_on_cycle", "land_cover_data/leaf_on_cycle"),
+    )
+
     def __init__(self, granule: gedi_granule.GediGranule, beam_name: str):
         super().__init__(granule=granule, beam_name=beam_name)
 
     @property
     def shot_geolocations(self) -> gpd.array.GeometryArray:
-        if self._shot_geolocations == None:
-            self._shot_geolocations = gpd.points_from_xy(
-                x=self["lon_lowestmode"],
-                y=self["lat_lowestmode"],
-                crs=WGS84,
+        if self._shot_geolocations is None:
+            points = shapely.points(
+                self._read("lon_lowestmode"), self._read("lat_lowestmode")
             )
+            self._shot_geolocations = gpd.array.from_shapely(points, crs=WGS84)
         return self._shot_geolocations
 
     def _get_main_data_dict(self) -> dict:
@@ -31,54 +75,9 @@ class L4ABeam(gedi_granule.GediBeam):
         Returns: A dictionary containing the main data for all shots in the given
             beam of the granule.
         """
-        gedi_l4a_count_start = pd.to_datetime("2018-01-01T00:00:00Z")
-        data = {
-            # General identifiable data
-            "granule_name": [self.parent_granule.filename] * self.n_shots,
-            "shot_number": self["shot_number"][:],
-            "beam_type": [self.beam_type] * self.n_shots,
-            "beam_name": [self.name] * self.n_shots,
-            # Temporal data
-            "delta_time": self["delta_time"][:],
-            "absolute_time": (
-                gedi_l4a_count_start
-                + pd.to_timedelta(self["delta_time"], unit="seconds")
-            ),
-            # Quality data
-            "sensitivity_a0": self["sensitivity"][:],
-            "sensitivity_a2": self["geolocation/sensitivity_a2"][:],
-            "sensitivity_a10": self["geolocation/sensitivity_a10"][:],
-            "algorithm_run_flag": self["algorithm_run_flag"][:],
-            "degrade_flag": self["degrade_flag"][:],
-            "l2_quality_flag": self["l2_quality_flag"][:],
-            "l4_quality_flag": self["l4_quality_flag"][:],
-            "predictor_limit_flag": self["predictor_limit_flag"][:],
-            "response_limit_flag": self["response_limit_flag"][:],
-            "surface_flag": self["surface_flag"][:],
-            # Processing data
-            "selected_algorithm": self["selected_algorithm"][:],
-            "selected_mode": self["selected_mode"][:],
-            # Geolocation data
-            "elev_lowestmode": self["elev_lowestmode"][:],
-            "lat_lowestmode": self["lat_lowestmode"][:],
-            "lon_lowestmode": self["lon_lowestmode"][:],
-            # ABGD data
-            "agbd": self["agbd"][:],
-            "agbd_pi_lower": self["agbd_pi_lower"][:],
-            "agbd_pi_upper": self["agbd_pi_upper"][:],
-            "agbd_se": self["agbd_se"][:],
-            "agbd_t": self["agbd_t"][:],
-            "agbd_t_se": self["agbd_t_se"][:],
-            # Land cover data: NOTE this is gridded and/or derived data
-            "pft_class": self["land_cover_data/pft_class"][:],
-            "region_class": self["land_cover_data/region_class"][:],
-            "urban_proportion": self["land_cover_data/urban_proportion"][:],
-            "landsat_water_persistence": self[
-                "land_cover_data/landsat_water_persistence"
-            ][:],
-            "leaf_on_doy": self["land_cover_data/leaf_on_doy"][:],
-            "leaf_on_cycle": self["land_cover_data/leaf_on_cycle"][:],
-        }
+        arrays = self._bulk_read(path for _, path in self._COLUMNS)
+        data = {name: arrays[path] for name, path in self._COLUMNS}
+        data["absolute_time"] = self._absolute_time(data["absolute_time"])
         return data
 
     def quality_filter(self):
@@ -89,27 +88,27 @@ class L4ABeam(gedi_granule.GediBeam):
         """
 
         filtered = self.main_data
-        filtered = filtered[
-            (filtered["l2_quality_flag"] == 1)
-            # & (filtered["l4_quality_flag"] == 1)
-            # & (filtered["algorithm_run_flag"] == 1)
-            & (filtered["sensitivity_a0"] >= 0.9)
-            & (filtered["sensitivity_a0"] <= 1.0)
-            & (filtered["sensitivity_a2"] <= 1.0)
-            & (filtered["degrade_flag"].isin(gedi_granule.QDEGRADE))
-            & (filtered["surface_flag"] == 1)
-        ]
-        filtered = filtered[
-            ((filtered["pft_class"] == 2) & (filtered["sensitivity_a2"] > 0.98))
-            | (
-                (filtered["pft_class"] != 2)
-                & (filtered["sensitivity_a2"] > 0.95)
-            )
-        ]
-        filtered = filtered[
-            (filtered["landsat_water_persistence"] < 10)
-            & (filtered["urban_proportion"] < 50)
-        ]
+        # Combine the conditions in place on the raw arrays, rather than
+        # allocating a new boolean Series for every comparison and `&`.
+        sensitivity_a0 = filtered["sensitivity_a0"].to_numpy()
+        sensitivity_a2 = filtered["sensitivity_a2"].to_numpy()
+        mask = filtered["l2_quality_flag"].to_numpy() == 1
+        # mask &= filtered["l4_quality_flag"].to_numpy() == 1
+        # mask &= filtered["algorithm_run_flag"].to_numpy() == 1
+        mask &= sensitivity_a0 >= 0.9
+        mask &= sensitivity_a0 <= 1.0
+        mask &= sensitivity_a2 <= 1.0
+        mask &= gedi_granule.QDEGRADE_LUT[filtered["degrade_flag"].to_numpy()]
+        mask &= filtered["surface_flag"].to_numpy() == 1
+        # Evergreen broadleaf (pft 2) needs a higher sensitivity
+        mask &= np.where(
+            filtered["pft_class"].to_numpy() == 2,
+            sensitivity_a2 > 0.98,
+            sensitivity_a2 > 0.95,
+        )
+        mask &= filtered["landsat_water_persistence"].to_numpy() < 10
+        mask &= filtered["urban_proportion"].to_numpy() < 50
+        filtered = filtered.iloc[np.flatnonzero(mask)]
         filtered = filtered.drop(
             [
                 "l2_quality_flag",
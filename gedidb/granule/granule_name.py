@@ -5,7 +5,7 @@ import re
 # GEDI02_A_YYYYDDDHHMMSS_O[orbit_number]_[granule_number]_T[track_number]_[PPDS_type]_ [release_number]_[production_version]_V[version_number].h5
 
 
-@dataclass
+@dataclass(frozen=True)
 class GediNameMetadata:
     """Data class container for metadata derived from GEDI file name conventions. THE ORDER MUST MATCH THE ORDER OF THE REGEX GROUPS."""
 
@@ -41,25 +41,28 @@ GEDI_SUBPATTERN = GediNameMetadata(
 )
 
 
-def parse_granule_filename(gedi_filename: str) -> GediNameMetadata:
-    gedi_naming_pattern = re.compile(
-        (
-            f"({GEDI_SUBPATTERN.product})"
-            f"_({GEDI_SUBPATTERN.year})"
-            f"({GEDI_SUBPATTERN.julian_day})"
-            f"({GEDI_SUBPATTERN.hour})"
-            f"({GEDI_SUBPATTERN.minute})"
-            f"({GEDI_SUBPATTERN.second})"
-            f"_({GEDI_SUBPATTERN.orbit})"
-            f"_({GEDI_SUBPATTERN.sub_orbit_granule})"
-            f"_({GEDI_SUBPATTERN.ground_track})"
-            f"_({GEDI_SUBPATTERN.positioning})"
-            f"_({GEDI_SUBPATTERN.release_number})"
-            f"_({GEDI_SUBPATTERN.granule_production_version})"
-            f"_({GEDI_SUBPATTERN.major_version_number})"
-        )
+# Compiled once at import: granule filenames are parsed in large batches.
+GEDI_NAMING_PATTERN = re.compile(
+    (
+        f"({GEDI_SUBPATTERN.product})"
+        f"_({GEDI_SUBPATTERN.year})"
+        f"({GEDI_SUBPATTERN.julian_day})"
+        f"({GEDI_SUBPATTERN.hour})"
+        f"({GEDI_SUBPATTERN.minute})"
+        f"({GEDI_SUBPATTERN.second})"
+        f"_({GEDI_SUBPATTERN.orbit})"
+        f"_({GEDI_SUBPATTERN.sub_orbit_granule})"
+        f"_({GEDI_SUBPATTERN.ground_track})"
+        f"_({GEDI_SUBPATTERN.positioning})"
+        f"_({GEDI_SUBPATTERN.release_number})"
+        f"_({GEDI_SUBPATTERN.granule_production_version})"
+        f"_({GEDI_SUBPATTERN.major_version_number})"
     )
-    parse_result = re.search(gedi_naming_pattern, gedi_filename)
+)
+
+
+def parse_granule_filename(gedi_filename: str) -> GediNameMetadata:
+    parse_result = GEDI_NAMING_PATTERN.search(gedi_filename)
     if parse_result is None:
         raise ValueError(
             f"Filename {gedi_filename} does not conform the the GEDI naming pattern."
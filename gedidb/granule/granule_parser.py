@@ -1,11 +1,14 @@
-from typing import Optional
+import concurrent.futures
+from typing import Iterable, Optional
 from tqdm.auto import tqdm
 import geopandas as gpd
+import numpy as np
 import pandas as pd
 from pathlib import Path
+import shapely
 import warnings
 
-from gedidb.granule.gedi_granule import GediGranule  # for typing only
+from gedidb.granule.gedi_granule import GediBeam, GediGranule  # for typing only
 from gedidb.granule.gedi_l4a import L4AGranule
 from gedidb.granule.gedi_l2b import L2BGranule
 from gedidb.granule.gedi_l2a import L2AGranule
@@ -15,59 +18,144 @@ from typing import Union
 
 
 def parse_file(
-    product: Union[str, GediProduct], file: Path, quality_filter=True
+    product: Union[str, GediProduct],
+    file: Path,
+    quality_filter=True,
+    columns: Optional[Iterable[str]] = None,
+    suppress_warnings=True,
 ) -> gpd.GeoDataFrame:
+    """Parses a GEDI granule file into a GeoDataFrame of its shots.
+
+    If columns is given, only those columns (and the geometry) are kept.
+    They are selected right after quality filtering, so the other columns
+    are never formatted or concatenated across beams.
+
+    warnings.catch_warnings is not thread-safe, so callers that parse
+    several files in threads should pass suppress_warnings=False and
+    suppress warnings once around all of them.
+    """
     product = GediProduct(product)
+    args = (file, quality_filter, columns, suppress_warnings)
     if product == GediProduct.L4A:
-        return parse_file_l4a(file, quality_filter)
+        return parse_file_l4a(*args)
     elif product == GediProduct.L2B:
-        return parse_file_l2b(file, quality_filter)
+        return parse_file_l2b(*args)
     elif product == GediProduct.L2A:
-        return parse_file_l2a(file, quality_filter)
+        return parse_file_l2a(*args)
     else:
         raise ValueError(f"Product {product} not supported")
 
 
-def parse_file_l4a(file: Path, quality_filter=True) -> gpd.GeoDataFrame:
+def parse_file_l4a(
+    file: Path,
+    quality_filter=True,
+    columns: Optional[Iterable[str]] = None,
+    suppress_warnings=True,
+) -> gpd.GeoDataFrame:
     granule = L4AGranule(file)
-    return _parse(granule, quality_filter)
+    return _parse(granule, quality_filter, columns, suppress_warnings)
 
 
-def parse_file_l2b(file: Path, quality_filter=True) -> gpd.GeoDataFrame:
+def parse_file_l2b(
+    file: Path,
+    quality_filter=True,
+    columns: Optional[Iterable[str]] = None,
+    suppress_warnings=True,
+) -> gpd.GeoDataFrame:
     granule = L2BGranule(file)
-    return _parse(granule, quality_filter)
+    return _parse(granule, quality_filter, columns, suppress_warnings)
 
 
-def parse_file_l2a(file: Path, quality_filter=True) -> gpd.GeoDataFrame:
+def parse_file_l2a(
+    file: Path,
+    quality_filter=True,
+    columns: Optional[Iterable[str]] = None,
+    suppress_warnings=True,
+) -> gpd.GeoDataFrame:
     granule = L2AGranule(file)
-    return _parse(granule, quality_filter)
-
-
-def _parse(granule: GediGranule, quality_filter=True) -> gpd.GeoDataFrame:
-    granule_data = []
-    for beam in granule.iter_beams():
-        try:
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
-                if quality_filter:
-                    beam.quality_filter()
-                beam.sql_format_arrays()
-                granule_data.append(beam.main_data)
-        except KeyError as e:
-            continue
-    df = pd.concat(granule_data, ignore_index=True)
-    gdf = gpd.GeoDataFrame(df, crs=WGS84)
+    return _parse(granule, quality_filter, columns, suppress_warnings)
+
+
+def _process_beam(
+    beam: GediBeam, quality_filter=True, columns: Optional[Iterable[str]] = None
+) -> Optional[gpd.GeoDataFrame]:
+    try:
+        if quality_filter:
+            beam.quality_filter()
+        if columns is not None:
+            beam.select_columns(columns)
+        beam.sql_format_arrays()
+        return beam.main_data
+    except KeyError:
+        return None
+
+
+def _parse(
+    granule: GediGranule,
+    quality_filter=True,
+    columns: Optional[Iterable[str]] = None,
+    suppress_warnings=True,
+) -> gpd.GeoDataFrame:
+    if suppress_warnings:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return _parse(granule, quality_filter, columns, False)
+
+    # Each beam is filtered and formatted independently, so process them
+    # concurrently; h5py still serializes the reads themselves.
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(1, min(8, granule.n_beams))
+    ) as executor:
+        beam_data = executor.map(
+            lambda beam: _process_beam(beam, quality_filter, columns),
+            granule.iter_beams(),
+        )
+        granule_data = [data for data in beam_data if data is not None]
+    df = pd.concat(_unify_categories(granule_data), ignore_index=True)
+    gdf = gpd.GeoDataFrame(df, geometry="geometry", crs=WGS84)
     granule.close()
     return gdf
 
 
+def _unify_categories(frames: list[pd.DataFrame]) -> list[pd.DataFrame]:
+    """Gives each categorical column the same categories in every frame.
+
+    pd.concat only keeps a categorical dtype when the categories match;
+    otherwise e.g. the per-beam beam_name columns fall back to strings.
+    """
+    if not frames:
+        return frames
+    categorical = [
+        c
+        for c, dtype in frames[0].dtypes.items()
+        if isinstance(dtype, pd.CategoricalDtype)
+    ]
+    categories = {
+        c: pd.api.types.union_categoricals(
+            [f[c].array for f in frames if c in f]
+        ).categories
+        for c in categorical
+    }
+    return [
+        f.assign(
+            **{
+                c: f[c].cat.set_categories(cats)
+                for c, cats in categories.items()
+                if c in f
+            }
+        )
+        for f in frames
+    ]
+
+
 def spatial_filter_granules(
     gdf: gpd.GeoDataFrame, roi: Optional[gpd.GeoDataFrame]
 ) -> gpd.GeoDataFrame:
     if roi is None:
         return gdf
 
-    # Filter for shots that fall within the ROI
-    gdf_filtered = gpd.sjoin(gdf, roi, predicate="within", how="inner")
-    gdf_filtered = gdf_filtered.drop("index_right", axis=1)
-    return gdf_filtered
+    # Filter for shots that fall within the ROI. This is a filter, not a
+    # join: each shot is kept once, in order, however many ROI shapes hold it.
+    tree = shapely.STRtree(roi.geometry.to_numpy())
+    shot_idx, _ = tree.query(gdf.geometry.to_numpy(), predicate="within")
+    return gdf.iloc[np.unique(shot_idx)]
@@ -1,15 +1,22 @@
 import argparse
+import concurrent.futures
 import time
-from typing import Iterable, Tuple, List
+from typing import Iterable, Optional, Tuple, List
 import geopandas as gpd
+import io
+import multiprocessing
+import numpy as np
 import os
 import pandas as pd
 import pathlib
+import queue
 import shutil
-import subprocess
 import tempfile
 import warnings
 import pyarrow.lib
+import pyarrow.parquet
+import shapely
+from sqlalchemy import text
 from gedidb.database.column_to_field import FIELD_TO_COLUMN
 from gedidb.granule import granule_parser
 from gedidb.database import gedidb_common
@@ -20,13 +27,22 @@ from gedidb import constants, environment
 from gedidb.common import earthdata
 from gedidb.constants import GediProduct
 import hashlib
+import heapq
 
 
 def hash_string_list(string_list: list) -> str:
+    """Hashes a list of strings with MD5.
+
+    The digests name the granule parquet files and are stored in
+    gedi_granules, so changing the algorithm would orphan both.
+    """
     joined = ",".join([f"{len(item)}:{item}" for item in string_list])
     return hashlib.md5(joined.encode("utf-8")).hexdigest()
 
 
+# Concurrent downloads per Spark task; at most the session's pool size.
+DOWNLOAD_THREADS = 16
+
 PRODUCTS = [
     GediProduct.L2A,
     GediProduct.L2B,
@@ -39,32 +55,69 @@ def _get_granule_key_for_filename(filename: str) -> str:
     return f"{parsed.orbit}_{parsed.sub_orbit_granule}"
 
 
-def _get_saved_md_test():
-    # TODO: This makes no sense -- the shape and version could have changed.
-    # But, it's helpful for faster development.
-    md_file = environment.GEDI_PATH / "metadata.pickle"
-    if md_file.exists():
-        print("Using existing metadata: ", md_file)
-        import pickle
+# CMR only ever adds granules, so cached query results stay valid for a while
+METADATA_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
 
-        with open(md_file, "rb") as f:
-            return pickle.load(f)
+
+def _get_metadata_cache_path(
+    shape: gpd.GeoSeries, products: List[GediProduct]
+) -> pathlib.Path:
+    key = hashlib.blake2b(digest_size=16)
+    for wkb in shape.to_wkb():
+        key.update(wkb)
+    key.update(",".join(product.value for product in products).encode())
+    return (
+        environment.GEDI_PATH / "metadata_cache" / f"{key.hexdigest()}.parquet"
+    )
 
 
 def _get_granule_metadata(
-    shape: gpd.GeoSeries, products: List[str]
+    shape: gpd.GeoSeries, products: List[GediProduct]
 ) -> gpd.GeoDataFrame:
-    # if _get_saved_md_test() is not None:
-    #     return _get_saved_md_test()
+    """Returns the granule file metadata for the shape from the CMR API.
+
+    Results are cached on disk per (shape, products) for
+    METADATA_CACHE_TTL_SECONDS, since the queries can take a long time.
+    """
+    cache_file = _get_metadata_cache_path(shape, products)
+    if cache_file.exists() and (
+        time.time() - cache_file.stat().st_mtime < METADATA_CACHE_TTL_SECONDS
+    ):
+        print("Using cached metadata: ", cache_file)
+        return gpd.read_parquet(cache_file)
+
+    md = _query_granule_metadata(shape, products)
+    os.makedirs(cache_file.parent, exist_ok=True)
+    # Write to a temp file and rename it into place, so that concurrent
+    # runs never read a partially written cache file.
+    temp = tempfile.NamedTemporaryFile(
+        dir=cache_file.parent, suffix=".parquet", delete=False
+    )
+    try:
+        with temp:
+            md.to_parquet(temp)
+        os.replace(temp.name, cache_file)
+    finally:
+        # Only still there if writing or renaming it failed
+        if os.path.exists(temp.name):
+            os.remove(temp.name)
+    return md
+
 
-    md_list = []
-    for product in products:
+def _query_granule_metadata(
+    shape: gpd.GeoSeries, products: List[GediProduct]
+) -> gpd.GeoDataFrame:
+    def _query_one(product: GediProduct) -> pd.DataFrame:
         print("Querying NASA metadata API for product: ", product.value)
         df = cmr.query(product, spatial=shape)
         df.rename({"granule_name": "granule_file"}, axis=1, inplace=True)
         df["granule_key"] = df.granule_file.map(_get_granule_key_for_filename)
         df["product"] = product.value
-        md_list.append(df)
+        return df
+
+    # The queries are independent network round-trips, so run them together.
+    with concurrent.futures.ThreadPoolExecutor(len(products)) as executor:
+        md_list = list(executor.map(_query_one, products))
     md = gpd.GeoDataFrame(
         pd.concat(md_list), geometry="granule_poly"
     ).reset_index()
@@ -88,6 +141,15 @@ def _get_granule_metadata(
     return md
 
 
+def _fetch(url: str, path: str) -> None:
+    """Streams url to path over this process's pooled earthdata session."""
+    with earthdata.session().get(url, stream=True) as response:
+        response.raise_for_status()
+        with open(path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=1 << 20):
+                f.write(chunk)
+
+
 def _download_url(
     input: Tuple[str, str, str, str]
 ) -> Tuple[str, Tuple[GediProduct, pathlib.Path]]:
@@ -103,24 +165,9 @@ def _download_url(
         temp = tempfile.NamedTemporaryFile(
             dir=environment.gedi_product_path(product),
         )
-        subprocess.run(
-            [
-                "wget",
-                "--load-cookies",
-                environment.EARTH_DATA_COOKIE_FILE,
-                "--save-cookies",
-                environment.EARTH_DATA_COOKIE_FILE,
-                "--auth-no-challenge=on",
-                "--keep-session-cookies",
-                "--content-disposition",
-                "-O",
-                temp.name,
-                url,
-            ],
-            check=True,
-        )
+        _fetch(url, temp.name)
         # Sometimes the LP DAAC serves an empty L2A file even though the file exists.
-        # This ... is very annoying. It does not produce a wget error,
+        # This ... is very annoying. It does not produce an HTTP error,
         #           so we have to check for it manually.
         # Wait 5 seconds and try downloading again. If that doesn't work,
         # we have no choice but to raise.
@@ -128,22 +175,7 @@ def _download_url(
         # for large downloads so that the script doesn't crash all the time.
         if os.path.getsize(temp.name) == 0:
             time.sleep(5)
-            subprocess.run(
-                [
-                    "wget",
-                    "--load-cookies",
-                    environment.EARTH_DATA_COOKIE_FILE,
-                    "--save-cookies",
-                    environment.EARTH_DATA_COOKIE_FILE,
-                    "--auth-no-challenge=on",
-                    "--keep-session-cookies",
-                    "--content-disposition",
-                    "-O",
-                    temp.name,
-                    url,
-                ],
-                check=True,
-            )
+            _fetch(url, temp.name)
             if os.path.getsize(temp.name) == 0:
                 raise ValueError(f"Empty file: {url}")
         shutil.move(temp.name, outfile_path)
@@ -157,6 +189,56 @@ def _download_url(
     return return_value
 
 
+def _download_batch(
+    rows: Iterable[Tuple[str, Tuple[str, str, str, str]]],
+) -> Iterable[Tuple[str, Tuple[GediProduct, pathlib.Path]]]:
+    """Downloads the (granule_key, row) pairs of a Spark partition.
+
+    Downloads are network-bound, so each task runs several at once, over
+    the connections of the shared earthdata session.
+    """
+    with concurrent.futures.ThreadPoolExecutor(DOWNLOAD_THREADS) as executor:
+        yield from executor.map(_download_url, (row for _, row in rows))
+
+
+def _get_ingested_fields(product: GediProduct) -> list[str]:
+    """Returns the (unsuffixed) fields of product that go into the DB."""
+    suffix = f"_{product.value}"
+    return ["shot_number"] + [
+        field.removesuffix(suffix)
+        for field in FIELD_TO_COLUMN
+        if field.endswith(suffix)
+    ]
+
+
+def _join_on_shot_number(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Inner-joins frames on shot_number, in the row order of the first.
+
+    Shot numbers are unique within a product, so intersecting the sorted
+    shot numbers gives each frame's rows directly, without building and
+    probing a hash index per join.
+    """
+    shots = frames[0]["shot_number"].to_numpy()
+    positions = [np.arange(len(shots))]
+    for frame in frames[1:]:
+        shots, kept, matched = np.intersect1d(
+            shots, frame["shot_number"].to_numpy(), return_indices=True
+        )
+        positions = [p[kept] for p in positions] + [matched]
+    order = np.argsort(positions[0])
+    first = frames[0].iloc[positions[0][order]]
+    return pd.concat(
+        [first]
+        + [
+            frame.drop(columns="shot_number")
+            .iloc[p[order]]
+            .set_axis(first.index)
+            for frame, p in zip(frames[1:], positions[1:])
+        ],
+        axis=1,
+    )
+
+
 def _process_granule(
     row: Tuple[str, Iterable[Tuple[GediProduct, pathlib.Path]]]
 ):
@@ -173,32 +255,61 @@ def _process_granule(
 
     gdfs = {}
     # 1. Parse each file and run per-product filtering.
-    for product, file in granules:
+    # The files are independent, so parse them concurrently; h5py serializes
+    # the HDF5 calls, but the numpy and pandas work around them overlaps.
+    # warnings.catch_warnings is not thread-safe, so warnings are suppressed
+    # once here rather than in each parsing thread.
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=3)
         try:
-            gdfs[product] = (
-                granule_parser.parse_file(product, file, quality_filter=True)
-                .rename(lambda x: f"{x}_{product.value}", axis=1)
-                .rename({f"shot_number_{product.value}": "shot_number"}, axis=1)
-            )
-            if gdfs[product].empty:
-                # Write an empty file as a placeholder
-                # TODO(amelia): Can we do something better here?
-                # we could at least use the columns in the schema
-                with warnings.catch_warnings():
-                    warnings.simplefilter("ignore")
-                    gdfs[product].to_parquet(outfile_path)
-                return return_value
-
-        except:
-            # TODO: Better error recovery for failed granules.
-            with open(
-                "/home/ah2174/gedi-database/logs/failed_granules.txt",
-                "a+",
-            ) as f:
-                f.write(f"{granule_key}\n")
-                f.write(f"{file}\n")
-                f.write(f"{included_files}\n")
-                raise
+            parsed = [
+                (
+                    product,
+                    file,
+                    executor.submit(
+                        granule_parser.parse_file,
+                        product,
+                        file,
+                        quality_filter=True,
+                        columns=_get_ingested_fields(product),
+                        suppress_warnings=False,
+                    ),
+                )
+                for product, file in granules
+            ]
+            for product, file, future in parsed:
+                try:
+                    gdfs[product] = (
+                        future.result()
+                        .rename(lambda x: f"{x}_{product.value}", axis=1)
+                        .rename(
+                            {f"shot_number_{product.value}": "shot_number"},
+                            axis=1,
+                        )
+                    )
+                    if gdfs[product].empty:
+                        # Write an empty file as a placeholder
+                        # TODO(amelia): Can we do something better here?
+                        # we could at least use the columns in the schema
+                        gdfs[product].to_parquet(outfile_path)
+                        return return_value
+
+                except:
+                    # TODO: Better error recovery for failed granules.
+                    with open(
+                        "/home/ah2174/gedi-database/logs/failed_granules.txt",
+                        "a+",
+                    ) as f:
+                        f.write(f"{granule_key}\n")
+                        f.write(f"{file}\n")
+                        f.write(f"{included_files}\n")
+                        raise
+        finally:
+            # On an early return, skip the parses that have not started,
+            # but let the running ones finish and close their files while
+            # warnings are still suppressed.
+            executor.shutdown(wait=True, cancel_futures=True)
 
     # 2. Join all products on shot_number.
     # Shots must be present in ALL THREE products to be included.
@@ -212,22 +323,16 @@ def _process_granule(
     #  - L2B stale_return_flag == 0
     #  - UMD outliers: need EASE72 grid info
 
-    gdf = (
-        gdfs[GediProduct.L2A]
-        .join(
-            gdfs[GediProduct.L2B].set_index("shot_number"),
-            on="shot_number",
-            how="inner",
-        )
-        .join(
-            gdfs[GediProduct.L4A].set_index("shot_number"),
-            on="shot_number",
-            how="inner",
-        )
-        .drop(["geometry_level2B", "geometry_level4A"], axis=1)
-        .set_geometry("geometry_level2A")
-        .rename_geometry("geometry")
-    )
+    gdf = gpd.GeoDataFrame(
+        _join_on_shot_number(
+            [
+                gdfs[GediProduct.L2A],
+                gdfs[GediProduct.L2B].drop(columns="geometry_level2B"),
+                gdfs[GediProduct.L4A].drop(columns="geometry_level4A"),
+            ]
+        ),
+        geometry="geometry_level2A",
+    ).rename_geometry("geometry")
 
     gdf["granule"] = granule_key
 
@@ -237,14 +342,58 @@ def _process_granule(
 
     # 4. Write to parquet
     os.makedirs(outfile_path.parent, exist_ok=True)
+    # The file is read back whole by _write_db, so store it as a single
+    # row group and favour size (zstd) over snappy's slightly faster reads.
     gdf.to_parquet(
-        outfile_path, allow_truncated_timestamps=True, coerce_timestamps="us"
+        outfile_path,
+        allow_truncated_timestamps=True,
+        coerce_timestamps="us",
+        compression="zstd",
+        compression_level=3,
+        use_dictionary=True,
+        row_group_size=max(len(gdf), 1),
     )
     return return_value
 
 
-def _write_db(input):
+def _copy_shots(conn, gedi_data: gpd.GeoDataFrame, table: str) -> None:
+    """Appends shots to a table with a single COPY instead of INSERTs.
+
+    The rows are streamed as CSV, with the geometry as hex EWKB,
+    which PostGIS parses directly. float32 columns are widened to float64
+    first, so they are written with the same values to_postgis stored
+    (e.g. 0.10000000149011612 rather than 0.1).
+
+    Timestamp columns are timestamp without time zone and hold UTC times.
+    COPY would silently drop the "+00:00" offset of tz-aware values, so
+    they are converted to naive UTC explicitly here; the stored times
+    never depend on the server's TimeZone setting.
+    """
+    geometry = shapely.set_srid(gedi_data.geometry.to_numpy(), 4326)
+    data = gedi_data.drop(columns="geometry").assign(
+        geometry=shapely.to_wkb(geometry, hex=True, include_srid=True)
+    )
+    data = data.astype(
+        {c: "float64" for c in data.select_dtypes("float32").columns}
+    )
+    for c in data.select_dtypes("datetimetz").columns:
+        data[c] = data[c].dt.tz_convert(None)
+    buffer = io.StringIO()
+    data.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    with conn.connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(data.columns)}) FROM STDIN "
+            "WITH (FORMAT CSV)",
+            buffer,
+        )
+
+
+def _write_db(input, conn=None):
     granule_key, outfile_path, included_files = input
+    if conn is None:
+        with gedidb_common.get_engine().connect() as conn:
+            return _write_db(input, conn)
 
     # Write all shots in the granule dataframe in a transaction while inserting
     # the granule name into the granule table.
@@ -254,21 +403,28 @@ def _write_db(input):
     # This is important because it allows us to drop indexes and key constraints
     # on the table while inserting, which increases performance considerably.
     try:
-        gedi_data = gpd.read_parquet(outfile_path)
+        # Empty placeholder files lack the columns below, so check the
+        # row count (in the footer) before reading.
+        if pyarrow.parquet.ParquetFile(outfile_path).metadata.num_rows == 0:
+            return
+        # Only the columns that go into the DB are read from disk.
+        gedi_data = gpd.read_parquet(
+            outfile_path, columns=list(FIELD_TO_COLUMN.keys())
+        )
     except pyarrow.lib.ArrowInvalid as e:
         print(f"WARNING: Corrupted file {outfile_path}")
         print(e)
         os.remove(outfile_path)
         return
 
-    if gedi_data.empty:
-        return
-    gedi_data = gedi_data[list(FIELD_TO_COLUMN.keys())]
     gedi_data = gedi_data.rename(columns=FIELD_TO_COLUMN)
     gedi_data = gedi_data.astype({"shot_number": "int64"})
     print(f"Writing granule: {granule_key}")
 
-    with gedidb_common.get_engine().begin() as conn:
+    with conn.begin():
+        # A crash may lose the last few commits, but never half a granule:
+        # the granule row is lost with its shots and is simply re-ingested.
+        conn.execute(text("SET LOCAL synchronous_commit = off"))
         granule_entry = pd.DataFrame(
             data={
                 "granule_name": [granule_key],
@@ -287,39 +443,183 @@ def _write_db(input):
             if_exists="append",
         )
 
-        gedi_data.to_postgis(
-            name="filtered_l2ab_l4a_shots",
-            con=conn,
-            index=False,
-            if_exists="append",
-        )
+        _copy_shots(conn, gedi_data, "filtered_l2ab_l4a_shots")
         conn.commit()
         del gedi_data
     return granule_entry
 
 
-def exec_spark(
+def _write_db_batch(inputs: Iterable[Tuple[str, pathlib.Path, List[str]]]):
+    """Writes the granules of a Spark partition over a single connection.
+
+    Each granule is still written in its own transaction (see _write_db).
+    """
+    with gedidb_common.get_engine().connect() as conn:
+        for input in inputs:
+            yield _write_db(input, conn)
+
+
+def _get_missing_granule_keys(granule_keys: pd.Series) -> pd.Series:
+    """Returns the granule keys that are not yet in the gedi_granules table.
+
+    The keys are joined against the table in the database, so only the
+    (few) missing keys come back rather than the whole table.
+    """
+    keys = [{"granule_key": key} for key in granule_keys.unique()]
+    with gedidb_common.get_engine().begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TEMPORARY TABLE _required_granules "
+                "(granule_key text PRIMARY KEY) ON COMMIT DROP"
+            )
+        )
+        if keys:
+            conn.execute(
+                text("INSERT INTO _required_granules VALUES (:granule_key)"),
+                keys,
+            )
+        missing = pd.read_sql_query(
+            text(
+                "SELECT r.granule_key FROM _required_granules r "
+                "LEFT JOIN gedi_granules g ON g.granule_name = r.granule_key "
+                "WHERE g.granule_name IS NULL"
+            ),
+            conn,
+        )
+    return missing.granule_key
+
+
+def _balance_partitions(sizes: pd.Series, n_partitions: int) -> dict:
+    """Assigns each key of sizes to one of n_partitions partitions.
+
+    Greedy longest-processing-time assignment: the largest remaining item
+    goes to the partition with the smallest total so far.
+    """
+    partitions = [(0.0, i) for i in range(n_partitions)]
+    partition_of = {}
+    for key, size in sizes.sort_values(ascending=False).items():
+        total, i = heapq.heappop(partitions)
+        partition_of[key] = i
+        heapq.heappush(partitions, (total + size, i))
+    return partition_of
+
+
+def _get_required_granules(
+    shape: gpd.GeoSeries, confirm: bool, dry_run: bool
+) -> Optional[gpd.GeoDataFrame]:
+    """Returns the metadata of the granule files still to be ingested.
+
+    Returns None if this is a dry run.
+    """
+    earthdata.authenticate()
+    # 1. Construct table of file metadata from CMR API
+    required_granules = _get_granule_metadata(shape, PRODUCTS)
+    # TODO(amelia): Also deal with the hash correctly
+    missing_keys = _get_missing_granule_keys(required_granules.granule_key)
+    required_granules = required_granules[
+        required_granules.granule_key.isin(missing_keys)
+    ]
+
+    if dry_run:
+        return None
+    if confirm:
+        input("To proceed, press ENTER >>> ")
+    return required_granules
+
+
+def exec_local(
     shape: gpd.GeoSeries,
     confirm: bool = True,
     download_only: bool = False,
     dry_run: bool = False,
+    processes: int = 8,
 ):
-    earthdata.authenticate()
-    # 1. Construct table of file metadata from CMR API
-    required_granules = _get_granule_metadata(shape, PRODUCTS)
-    with gedidb_common.get_engine().connect() as conn:
-        # TODO(amelia): Also deal with the hash correctly
-        existing_granules = pd.read_sql_query(
-            "SELECT granule_name FROM gedi_granules", conn
-        )
-        required_granules = required_granules[
-            ~required_granules.granule_key.isin(existing_granules.granule_name)
+    """Like exec_spark, but runs on this machine with a process pool.
+
+    For single-node runs this avoids the JVM and the per-task Py4J
+    overhead of Spark. Each granule is parsed as soon as all of its files
+    are downloaded, and a writer thread in this process ingests each
+    parsed granule as soon as the pool's callback hands it over, so
+    downloading, parsing and writing all overlap.
+    """
+    required_granules = _get_required_granules(shape, confirm, dry_run)
+    if required_granules is None:
+        return
+
+    name_url = required_granules[
+        [
+            "granule_key",
+            "granule_file",
+            "granule_url",
+            "product",
         ]
+    ].to_records(index=False)
+    if not download_only:
+        gedidb_common.maybe_create_tables()
+        gedidb_common.drop_shot_indexes()
+    parsed = queue.Queue()
+    with multiprocessing.Pool(
+        processes
+    ) as pool, concurrent.futures.ThreadPoolExecutor(max_workers=1) as writer:
+        if not download_only:
+            # 4. Ingest granule parquet files into PostGIS database
+            written = writer.submit(_write_queued, parsed)
+        try:
+            # 2. Download granule files to shared location
+            files_by_granule = {}
+            processed_granules = []
+            for granule_key, file in pool.imap_unordered(
+                _download_url, name_url
+            ):
+                files = files_by_granule.setdefault(granule_key, [])
+                files.append(file)
+                if not download_only and len(files) == len(PRODUCTS):
+                    # 3. Parse HDF5 files into per-granule filtered parquet
+                    processed_granules.append(
+                        pool.apply_async(
+                            _process_granule,
+                            ((granule_key, files),),
+                            callback=parsed.put,
+                        )
+                    )
+            incomplete = [
+                granule_key
+                for granule_key, files in files_by_granule.items()
+                if len(files) < len(PRODUCTS)
+            ]
+            if incomplete:
+                print(
+                    f"Skipping {len(incomplete)} granules with missing "
+                    f"products: {incomplete}"
+                )
+            # Re-raise any parsing errors
+            for result in processed_granules:
+                result.get()
+        finally:
+            if not download_only:
+                parsed.put(None)
+                try:
+                    written.result()
+                finally:
+                    gedidb_common.recreate_shot_indexes()
+    print("done")
 
-    if dry_run:
+
+def _write_queued(parsed: queue.Queue) -> None:
+    """Writes parsed granules from the queue until it yields None."""
+    for _ in _write_db_batch(iter(parsed.get, None)):
+        pass
+
+
+def exec_spark(
+    shape: gpd.GeoSeries,
+    confirm: bool = True,
+    download_only: bool = False,
+    dry_run: bool = False,
+):
+    required_granules = _get_required_granules(shape, confirm, dry_run)
+    if required_granules is None:
         return
-    if confirm:
-        input("To proceed, press ENTER >>> ")
 
     ## SPARK STARTS HERE ##
     # 2. Download granule files to shared location
@@ -332,11 +632,28 @@ def exec_spark(
             "product",
         ]
     ].to_records(index=False)
-    # TODO(amelia):
-    # Partition by granule because the L2A files are huge compared to the other
-    # products. Try to evenly distribute these files across workers.
-    urls = spark.sparkContext.parallelize(name_url)
-    files_by_granule = urls.map(_download_url).groupByKey()
+    # Partition by granule, so that every file of a granule is downloaded in
+    # the partition that groups them: groupByKey reuses the partitioner
+    # instead of shuffling the downloaded paths.
+    # The L2A files are huge compared to the other products, so granules
+    # are assigned to partitions by size rather than by hash.
+    n_partitions = spark.sparkContext.defaultParallelism
+    partition_of = _balance_partitions(
+        required_granules.groupby("granule_key")["granule_size"].sum(),
+        n_partitions,
+    )
+
+    def partition_func(granule_key: str) -> int:
+        return partition_of[granule_key]
+
+    urls = (
+        spark.sparkContext.parallelize(name_url)
+        .keyBy(lambda row: row[0])
+        .partitionBy(n_partitions, partition_func)
+    )
+    files_by_granule = urls.mapPartitions(
+        _download_batch, preservesPartitioning=True
+    ).groupByKey(n_partitions, partition_func)
 
     # 3. Parse HDF5 files into per-granule filtered parquet files
     # It would be nice if we could use Sedona for this,
@@ -346,11 +663,15 @@ def exec_spark(
 
     # # 4. Ingest granule parquet files into PostGIS database
     gedidb_common.maybe_create_tables()
-    # TODO granule_poly
-    # limit to 8 concurrent connections to avoid overwhelming the DB
-    # this number was chosen somewhat arbitrarily
-    out = processed_granules.coalesce(8).map(_write_db)
-    out.count()
+    gedidb_common.drop_shot_indexes()
+    try:
+        # TODO granule_poly
+        # limit to 8 concurrent connections to avoid overwhelming the DB
+        # this number was chosen somewhat arbitrarily
+        out = processed_granules.coalesce(8).mapPartitions(_write_db_batch)
+        out.count()
+    finally:
+        gedidb_common.recreate_shot_indexes()
 
     spark.stop()
     print("done")
@@ -385,6 +706,21 @@ if __name__ == "__main__":
         action=argparse.BooleanOptionalAction,
     )
     parser.set_defaults(download_only=False)
+    parser.add_argument(
+        "--engine",
+        help=(
+            "Run the pipeline on a Spark cluster, or locally with a "
+            "process pool (lighter for single-node runs)."
+        ),
+        choices=["spark", "local"],
+        default="spark",
+    )
+    parser.add_argument(
+        "--processes",
+        help="Number of worker processes for the local engine.",
+        type=int,
+        default=8,
+    )
     args = parser.parse_args()
 
     shapefile = pathlib.Path(args.shapefile)
@@ -410,9 +746,18 @@ if __name__ == "__main__":
         print("Please split up each row of your shapefile into its own file.")
         exit(1)
 
-    exec_spark(
-        shp,
-        confirm=args.confirm,
-        download_only=args.download_only,
-        dry_run=args.dry_run,
-    )
+    if args.engine == "local":
+        exec_local(
+            shp,
+            confirm=args.confirm,
+            download_only=args.download_only,
+            dry_run=args.dry_run,
+            processes=args.processes,
+        )
+    else:
+        exec_spark(
+            shp,
+            confirm=args.confirm,
+            download_only=args.download_only,
+            dry_run=args.dry_run,
+        )
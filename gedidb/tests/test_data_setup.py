@@ -0,0 +1,77 @@
+import unittest
+import numpy as np
+import pandas as pd
+
+from gedidb.pipeline.data_setup import (
+    _balance_partitions,
+    _join_on_shot_number,
+)
+
+
+class TestCase(unittest.TestCase):
+    def test_join_on_shot_number(self):
+        rng = np.random.default_rng(0)
+        shots = rng.permutation(np.arange(1000, 1100, dtype=np.uint64))
+        l2a = pd.DataFrame(
+            {
+                "shot_number": shots[:80],
+                "rh98": rng.random(80),
+                "beam_name": pd.Categorical(rng.choice(["a", "b"], 80)),
+            },
+            index=rng.permutation(80),
+        )
+        l2b = pd.DataFrame(
+            {"shot_number": shots[10:100], "pai": rng.random(90)}
+        )
+        l4a = pd.DataFrame(
+            {
+                "shot_number": rng.permutation(shots[5:95]),
+                "agbd": rng.random(90),
+            }
+        )
+
+        # The hash joins _join_on_shot_number replaced
+        expected = l2a.join(
+            l2b.set_index("shot_number"), on="shot_number", how="inner"
+        ).join(l4a.set_index("shot_number"), on="shot_number", how="inner")
+        joined = _join_on_shot_number([l2a, l2b, l4a])
+        self.assertEqual(len(joined), 70)
+        pd.testing.assert_frame_equal(joined, expected)
+
+    def test_join_on_shot_number_no_overlap(self):
+        l2a = pd.DataFrame({"shot_number": [1, 2], "rh98": [0.5, 0.25]})
+        l2b = pd.DataFrame({"shot_number": [3, 4], "pai": [0.5, 0.25]})
+        joined = _join_on_shot_number([l2a, l2b])
+        self.assertTrue(joined.empty)
+        self.assertEqual(list(joined.columns), ["shot_number", "rh98", "pai"])
+
+    def test_balance_partitions(self):
+        rng = np.random.default_rng(0)
+        sizes = pd.Series(
+            rng.lognormal(5, 1.5, 200),
+            index=[f"O{i:05d}_01" for i in range(200)],
+        )
+        n_partitions = 16
+        partition_of = _balance_partitions(sizes, n_partitions)
+        self.assertEqual(set(partition_of), set(sizes.index))
+        self.assertTrue(
+            all(0 <= p < n_partitions for p in partition_of.values())
+        )
+
+        # Naive partitioning: keys dealt out round-robin
+        naive = sizes.groupby(np.arange(len(sizes)) % n_partitions).sum()
+        balanced = sizes.groupby(pd.Series(partition_of)).sum()
+        self.assertLessEqual(balanced.max(), naive.max())
+        # The greedy bound: no partition exceeds the mean by more than
+        # the largest single item.
+        self.assertLessEqual(
+            balanced.max(), sizes.sum() / n_partitions + sizes.max()
+        )
+
+    def test_balance_partitions_more_partitions_than_keys(self):
+        sizes = pd.Series([3.0, 2.0, 1.0], index=["a", "b", "c"])
+        partition_of = _balance_partitions(sizes, 8)
+        self.assertEqual(len(set(partition_of.values())), 3)
+
+
+suite = unittest.TestLoader().loadTestsFromTestCase(TestCase)
@@ -0,0 +1,47 @@
+import unittest
+import numpy as np
+import pandas as pd
+
+from gedidb.granule.gedi_granule import GediBeam
+
+
+class TestCase(unittest.TestCase):
+    def test_absolute_time(self):
+        rng = np.random.default_rng(0)
+        delta_time = np.concatenate(
+            [
+                rng.uniform(0, 2e8, 1000),
+                [0.0, 0.5, 1e-9, 48576103.123456789, np.nan],
+            ]
+        )
+        # The pandas conversion _absolute_time replaced
+        expected = pd.to_datetime("2018-01-01T00:00:00Z") + pd.to_timedelta(
+            delta_time, unit="seconds"
+        )
+        absolute_time = GediBeam._absolute_time(delta_time)
+        pd.testing.assert_index_equal(absolute_time, expected)
+        self.assertTrue(pd.isna(absolute_time[-1]))
+
+    def test_arrs_to_str(self):
+        beam = GediBeam.__new__(GediBeam)
+        rng = np.random.default_rng(0)
+        col = pd.Series(
+            list(rng.random((20, 5), dtype=np.float32)),
+            index=rng.permutation(20),
+            name="pavd_z",
+        )
+        col[col.index[0]] = np.array([np.nan, 1e-8, 1e8, 0.0, -1.5], "f4")
+        pd.testing.assert_series_equal(
+            beam._arrs_to_str(col), col.map(beam._arr_to_str)
+        )
+
+    def test_arrs_to_str_ragged(self):
+        beam = GediBeam.__new__(GediBeam)
+        col = pd.Series([np.arange(3.0), np.arange(5.0), np.arange(0.0)])
+        pd.testing.assert_series_equal(
+            beam._arrs_to_str(col), col.map(beam._arr_to_str)
+        )
+        self.assertEqual(beam._arrs_to_str(col)[2], "{}")
+
+
+suite = unittest.TestLoader().loadTestsFromTestCase(TestCase)
@@ -1,7 +1,11 @@
+import functools
 import unittest
 import geopandas as gpd
+import numpy as np
 import pathlib
+import shapely
 from shapely import orient_polygons
+from shapely.geometry import Point, box
 
 from gedidb.common.shape_parser import (
     get_n_coords,
@@ -13,62 +17,98 @@ from gedidb.common.shape_parser import (
 
 
 THIS_DIR = pathlib.Path(__file__).parent
+# The test shape has:
+# - over 4999 coordinates
+# - multiple features (rows)
+# - multipolygons among the features
+# - polygons with holes
+# - geometries that span the antimeridian (180º)
+TEST_SHAPE = (
+    THIS_DIR
+    / "data"
+    / "southeast_asia_oceania_evergreen_moist_dry_forest_v2017"
+)
 
 
-class TestShapeParser(unittest.TestCase):
-    # The test shape has:
-    # - over 4999 coordinates
-    # - multiple features (rows)
-    # - multipolygons among the features
-    # - polygons with holes
-    # - geometries that span the antimeridian (180º)
-    TEST_SHAPE = (
-        THIS_DIR
-        / "data"
-        / "southeast_asia_oceania_evergreen_moist_dry_forest_v2017"
-    )
+@functools.lru_cache(maxsize=None)
+def _load_test_shape() -> gpd.GeoDataFrame:
+    # The test shape is large, so it is parsed once and shared by all tests.
+    # None of the functions under test modify their input.
+    return gpd.GeoDataFrame.from_file(TEST_SHAPE)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_test_shape_union() -> shapely.Geometry:
+    # Unioning the test shape is slow, so it is also only done once.
+    return _load_test_shape().union_all()
+
 
+class TestShapeParser(unittest.TestCase):
     def test_get_n_coords(self):
-        shp = gpd.GeoDataFrame.from_file(self.TEST_SHAPE)
+        shp = _load_test_shape()
         n_coords = get_n_coords(shp)
         self.assertEqual(n_coords, 346278)
 
     def test_orient_shape(self):
-        shp = gpd.GeoDataFrame.from_file(self.TEST_SHAPE)
-        disoriented = orient_shape(shp, exterior_cw=False)
-        oriented = orient_shape(disoriented, exterior_cw=True)
-        for poly in oriented:
-            if poly.geom_type.startswith("Multi"):
-                for part in poly.geoms:
-                    self.assertFalse(part.exterior.is_ccw)
-                    if len(part.interiors) > 0:
-                        for interior in part.interiors:
-                            self.assertTrue(interior.is_ccw)
-            else:
-                self.assertFalse(poly.exterior.is_ccw)
-                if len(poly.interiors) > 0:
-                    for interior in poly.interiors:
-                        self.assertTrue(interior.is_ccw)
+        shp = _load_test_shape()
+        for exterior_cw in (True, False):
+            with self.subTest(exterior_cw=exterior_cw):
+                # Start from the opposite orientation, so every ring flips.
+                disoriented = orient_shape(shp, exterior_cw=not exterior_cw)
+                oriented = orient_shape(disoriented, exterior_cw=exterior_cw)
+                polygons = shapely.get_parts(oriented.to_numpy())
+                exteriors = shapely.get_exterior_ring(polygons)
+                # Pair each polygon with each of its interior ring indices.
+                n_interiors = shapely.get_num_interior_rings(polygons)
+                first = np.repeat(
+                    np.cumsum(n_interiors) - n_interiors, n_interiors
+                )
+                interiors = shapely.get_interior_ring(
+                    np.repeat(polygons, n_interiors),
+                    np.arange(n_interiors.sum()) - first,
+                )
+                self.assertTrue(
+                    (shapely.is_ccw(exteriors) != exterior_cw).all()
+                )
+                self.assertTrue(
+                    (shapely.is_ccw(interiors) == exterior_cw).all()
+                )
 
     def test_get_covering_region_for_shape(self):
-        shp = gpd.GeoDataFrame.from_file(self.TEST_SHAPE)
+        shp = _load_test_shape()
+        covering = get_covering_region_for_shape(shp)
+        self.assertEqual(len(covering.geometry), 1)
+        # Every vertex of the shape lies in the covering region. Vertices
+        # on the antimeridian lie on its boundary, so test intersection.
+        xs, ys = shapely.get_coordinates(shp.geometry.to_numpy()).T
+        self.assertTrue(shapely.intersects_xy(covering.iloc[0], xs, ys).all())
+
+    def test_covering_region_includes_touching_tiles(self):
+        # A shape whose bounds lie on the 1 degree grid also touches
+        # the surrounding ring of tiles.
+        shp = gpd.GeoDataFrame(geometry=[box(2, 3, 4, 5)], crs="EPSG:4326")
         covering = get_covering_region_for_shape(shp)
         self.assertEqual(len(covering.geometry), 1)
-        self.assertTrue(covering.contains(shp.union_all()).all())
+        self.assertEqual(covering.iloc[0].bounds, (1.0, 2.0, 5.0, 6.0))
+        self.assertEqual(covering.iloc[0].area, 16.0)
 
     def test_detail_error(self):
-        shp = gpd.GeoDataFrame.from_file(self.TEST_SHAPE)
+        # Any shape with more than max_coords coordinates will do,
+        # so use a small one (33 coordinates) instead of the test shape.
+        shp = gpd.GeoDataFrame(
+            geometry=[Point(0, 0).buffer(1)], crs="EPSG:4326"
+        )
         max_coords = 5
         with self.assertRaises(DetailError):
             check_and_format_shape(shp, simplify=False, max_coords=max_coords)
 
     def test_check_and_format_shape(self):
-        shp = gpd.GeoDataFrame.from_file(self.TEST_SHAPE)
+        shp = _load_test_shape()
         # Test with simplification
         formatted = check_and_format_shape(shp, simplify=True, max_coords=4999)
         n_coords = get_n_coords(formatted)
         self.assertLessEqual(n_coords, 4999)
-        self.assertTrue(formatted.contains(shp.union_all()).all())
+        self.assertTrue(formatted.contains(_load_test_shape_union()).all())
 
         # Test without simplification should raise error
         with self.assertRaises(DetailError):
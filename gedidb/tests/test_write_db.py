@@ -36,8 +36,9 @@ GRANULE_NAME = "O02027_02"
 
 
 def _array_from_dictstring(dictstring):
-    dictstring = dictstring.replace("{", "").replace("}", "")
-    return [float(x) for x in dictstring.split(",")]
+    return np.fromstring(
+        dictstring.strip("{}"), sep=",", dtype=np.float64
+    ).tolist()
 
 
 class TestCase(unittest.TestCase):
@@ -1,4 +1,4 @@
-from setuptools import find_packages, setup
+from setuptools import setup
 
 setup(
     name="gedidb",
@@ -6,6 +6,15 @@ setup(
     author="Amelia Holcomb",
     author_email="ah2174@cl.cam.ac.uk",
     description="This package is designed to set up a database of GEDI data.",
-    packages=find_packages(),
-    test_suite="src.tests.test_all.suite",
+    # Listed explicitly: find_packages() walks the tree, and also skips the
+    # subpackages that have no __init__.py.
+    packages=[
+        "gedidb",
+        "gedidb.common",
+        "gedidb.database",
+        "gedidb.granule",
+        "gedidb.pipeline",
+        "gedidb.tests",
+    ],
+    extras_require={"test": ["pytest", "pytest-xdist"]},
 )